@@ -0,0 +1,569 @@
+"""Latency benchmarks for the dashboard render path, run headlessly without network access.
+
+The mlb_dashboard package is imported with pybaseball replaced by synthetic fixtures and
+statsapi/mlbstatic by a local stub server, each with a configurable upstream latency. Results
+are written to bench_results/<commit>.json and compared with a baseline run to catch
+regressions between commits. The fixtures can stand for the current season, last season
+(finished) or a current season that hasn't started yet, with --season; those runs are written
+to bench_results/<commit>-<season>.json and compared only with runs for the same season.
+
+  python bench_dashboard.py                      # run everything, compare with the latest result
+  python bench_dashboard.py --sessions 20 --only page
+  python bench_dashboard.py --season preseason --only page
+  python bench_dashboard.py --baseline bench_results/abc1234.json --threshold 0.2
+  python bench_dashboard.py --record snapshots/ && python bench_dashboard.py --replay snapshots/
+"""
+
+import argparse
+import datetime
+import json
+import os
+import random
+import re
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from pathlib import Path
+from types import SimpleNamespace
+from urllib.parse import urlparse, parse_qs
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent
+RESULTS_DIR = ROOT / "bench_results"
+
+SAMPLE_SVG = ('<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 100 100">'
+              '<path fill="#0E3386" d="M0 0h50v50H0z"/><path fill="#0E3386" d="M50 0h50v50H50z"/>'
+              '<path fill="#CC3433" d="M0 50h50v50H0z"/><path stroke="#FFFFFF" d="M50 50h50v50H50z"/></svg>')
+
+# Season the fixtures stand for: "current" is in progress, "past" benchmarks last season, which
+# is finished, and "preseason" moves the current season's opening day a week after today
+SEASONS = ["current", "past", "preseason"]
+FIXTURE_SEASON = "current"
+
+
+def bench_year():
+    return datetime.date.today().year - (FIXTURE_SEASON == "past")
+
+
+# Opening and final day of a season's fixture schedule
+def season_days(year):
+    today = datetime.date.today()
+    if FIXTURE_SEASON == "preseason" and year == today.year:
+        final = datetime.date(year, 12, 31)
+        return min(today + datetime.timedelta(days=7), final), final
+    return datetime.date(year, 3, 28), datetime.date(year, 9, 28)
+
+
+# Fixtures standing in for the pybaseball scrapers. Every call sleeps for the configured upstream
+# latency so cold fetches cost something, like the real scrapes do.
+class Fixtures:
+    def __init__(self, dashboard, latency):
+        self.dashboard = dashboard
+        self.latency = latency
+        self.abbrs = list(dashboard.mlb_teams)
+
+    def team_batting(self, year):
+        time.sleep(self.latency)
+        rng = np.random.default_rng(year)
+        frame = pd.DataFrame({'Team': self.abbrs})
+        for col in ['G', 'PA', 'AB', 'H', '1B', '2B', '3B', 'HR', 'R', 'RBI', 'BB', 'SO', 'SB', 'CS']:
+            frame[col] = rng.integers(100, 6000, len(self.abbrs))
+        for col in ['AVG', 'OBP', 'SLG', 'OPS', 'ISO', 'BABIP', 'wOBA', 'BB%', 'K%']:
+            frame[col] = rng.uniform(0.1, 0.8, len(self.abbrs)).round(3)
+        frame['wRC+'] = rng.integers(70, 130, len(self.abbrs))
+        frame['WAR'] = rng.uniform(5, 45, len(self.abbrs)).round(1)
+        return frame
+
+    def team_pitching(self, year):
+        time.sleep(self.latency)
+        rng = np.random.default_rng(year + 1)
+        frame = pd.DataFrame({'Team': self.abbrs})
+        for col in ['W', 'L', 'SV', 'G', 'GS', 'R', 'ER', 'HR', 'BB', 'SO']:
+            frame[col] = rng.integers(10, 1500, len(self.abbrs))
+        for col in ['ERA', 'FIP', 'xFIP', 'WHIP', 'K/9', 'BB/9']:
+            frame[col] = rng.uniform(1, 6, len(self.abbrs)).round(2)
+        frame['IP'] = rng.uniform(1400, 1480, len(self.abbrs)).round(1)
+        frame['WAR'] = rng.uniform(5, 25, len(self.abbrs)).round(1)
+        return frame
+
+    def standings(self, year):
+        time.sleep(self.latency)
+        started = season_days(year)[0] <= datetime.date.today()
+        tables = []
+        for division in self.dashboard.division_names:
+            teams = [abbr for abbr, name in self.dashboard.team_divisions.items() if name == division]
+            wins = [95, 88, 81, 74, 67] if started else [0] * 5
+            losses = [162 - w for w in wins] if started else [0] * 5
+            tables.append(pd.DataFrame({
+                'Tm': [self.dashboard.mlb_teams[abbr] for abbr in teams],
+                'W': [str(w) for w in wins],
+                'L': [str(l) for l in losses],
+                'W-L%': [f"{w / (w + l):.3f}" if w + l else ".000" for w, l in zip(wins, losses)],
+                'GB': ['--'] + [f"{(wins[0] - w):.1f}" for w in wins[1:]],
+                'E#': ['--', '20', '13', 'E', '☠'] if started else ['--'] + ['163'] * 4,
+            }))
+        return tables
+
+    def schedule_and_record(self, year, abbr):
+        time.sleep(self.latency)
+        rng = np.random.default_rng(sum(map(ord, abbr)) + year)
+        opening, final = season_days(year)
+        days = pd.date_range(opening, final)
+        played = days.date <= datetime.date.today()
+        results = np.where(rng.random(len(days)) < 0.5, 'W', 'L').astype(object)
+        results[~played] = None
+        runs = rng.integers(0, 10, len(days)).astype(float)
+        runs_against = np.where(results == 'W', np.maximum(runs - 1, 0), runs + 1)
+        streak = np.where(results == 'W', 1.0, -1.0)
+        streak[~played] = np.nan
+        return pd.DataFrame({
+            'Date': [f"{day:%A}, {day:%b} {day.day}" + (" (1)" if i % 15 == 14 else "") for i, day in enumerate(days)],
+            'Tm': abbr,
+            'Home_Away': np.where(rng.random(len(days)) < 0.5, 'Home', '@'),
+            'Opp': rng.choice(self.abbrs, len(days)),
+            'W/L': results,
+            'R': np.where(played, runs, np.nan),
+            'RA': np.where(played, runs_against, np.nan),
+            'Inn': np.where(rng.random(len(days)) < 0.1, 10, np.nan),
+            'Attendance': rng.integers(10000, 45000, len(days)).astype(float),
+            'Streak': streak,
+        })
+
+    def batting_stats_bref(self, year):
+        time.sleep(self.latency)
+        return self._players(year, 900, ['G', 'PA', 'AB', 'R', 'H', '2B', '3B', 'HR', 'RBI', 'BB', 'SO', 'HBP', 'SB'],
+                             ['BA', 'OBP', 'SLG', 'OPS'])
+
+    def pitching_stats_bref(self, year):
+        time.sleep(self.latency)
+        return self._players(year + 1, 800, ['G', 'GS', 'W', 'L', 'SV', 'H', 'R', 'ER', 'BB', 'SO', 'HR', 'HBP'],
+                             ['IP', 'ERA', 'WHIP'])
+
+    def _players(self, seed, count, counting, rates):
+        rng = np.random.default_rng(seed)
+        frame = pd.DataFrame({
+            'Name': [f"Player {i}" for i in range(count)],
+            'Age': rng.integers(20, 40, count).astype(str),
+            'Lev': rng.choice(['Maj-AL', 'Maj-NL'], count),
+            'Tm': rng.choice(self.abbrs, count),
+        })
+        frame['G'] = rng.integers(1, 150, count)
+        for col in counting:
+            if col != 'G':
+                frame[col] = rng.integers(0, 600, count)
+        for col in rates:
+            frame[col] = rng.uniform(0.1, 9, count).round(3)
+        if 'PA' in frame:
+            frame['PA'] = frame['G'] * rng.integers(1, 5, count)
+        if 'IP' in frame:
+            frame['IP'] = (frame['G'] * rng.uniform(0.5, 6, count)).round()
+        return frame
+
+
+# Local stand-in for statsapi.mlb.com and the mlbstatic logos
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    latency = 0.0
+    dashboard = None
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        url = urlparse(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        path = url.path
+        if path.endswith(".svg"):
+            if self.headers.get("If-None-Match") == '"logo"':
+                return self.reply(304, b"")
+            return self.reply(200, SAMPLE_SVG.encode(), {"ETag": '"logo"'})
+        body = self.route(path, query)
+        if body is None:
+            return self.reply(404, b"")
+        return self.reply(200, json.dumps(body).encode(), {"Content-Type": "application/json"})
+
+    def reply(self, status, body, headers=None):
+        self.send_response(status)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def route(self, path, query):
+        dashboard = self.dashboard
+        teams = [{'id': team_id, 'name': dashboard.mlb_teams[abbr]} for team_id, abbr in dashboard.statsapi_team_ids.items()]
+        if re.search(r"/teams/?$", path):
+            return {'teams': teams}
+        match = re.search(r"/teams/(\d+)/stats$", path)
+        if match:
+            rng = random.Random(int(match.group(1)))
+            if query.get('group') == 'pitching':
+                stat = {'gamesPlayed': 162, 'wins': rng.randint(60, 100), 'losses': rng.randint(60, 100), 'runs': rng.randint(550, 850),
+                        'earnedRuns': rng.randint(500, 780), 'era': f"{rng.uniform(3, 5.5):.2f}", 'whip': f"{rng.uniform(1.1, 1.45):.2f}",
+                        'inningsPitched': f"{rng.randint(1400, 1460)}.{rng.randint(0, 2)}", 'homeRuns': rng.randint(140, 240),
+                        'baseOnBalls': rng.randint(400, 600), 'hitByPitch': rng.randint(40, 80), 'strikeOuts': rng.randint(1200, 1600)}
+            else:
+                stat = {'gamesPlayed': 162, 'runs': rng.randint(550, 850), 'hits': rng.randint(1250, 1500), 'homeRuns': rng.randint(120, 260),
+                        'baseOnBalls': rng.randint(400, 650), 'strikeOuts': rng.randint(1200, 1600), 'stolenBases': rng.randint(50, 180),
+                        'avg': f".{rng.randint(230, 265)}", 'obp': f".{rng.randint(295, 335)}", 'slg': f".{rng.randint(370, 450)}", 'ops': f".{rng.randint(670, 780)}"}
+            return {'stats': [{'group': {'displayName': query.get('group')}, 'splits': [{'stat': stat}]}]}
+        match = re.search(r"/teams/(\d+)/roster$", path)
+        if match:
+            return {'roster': [{'person': {'id': int(match.group(1)) * 100 + i, 'fullName': f"Player {match.group(1)}-{i}"}} for i in range(26)]}
+        match = re.search(r"/people/(\d+)/stats$", path)
+        if match:
+            player_id = int(match.group(1))
+            rng = random.Random(player_id)
+            stats = [{'group': {'displayName': 'hitting'}, 'splits': [{'stat': {
+                'gamesPlayed': 100, 'plateAppearances': rng.randint(50, 650), 'homeRuns': rng.randint(0, 40),
+                'avg': '.250', 'obp': '.320', 'slg': f".{rng.randint(300, 550)}", 'ops': f".{rng.randint(600, 950)}"}}]}]
+            if player_id % 2:
+                stats.append({'group': {'displayName': 'pitching'}, 'splits': [{'stat': {
+                    'gamesPlayed': 30, 'inningsPitched': f"{rng.randint(20, 190)}.{rng.randint(0, 2)}", 'era': f"{rng.uniform(2, 6):.2f}",
+                    'whip': f"{rng.uniform(0.9, 1.6):.2f}", 'homeRuns': rng.randint(2, 30), 'baseOnBalls': rng.randint(5, 70),
+                    'strikeOuts': rng.randint(15, 230), 'hitByPitch': rng.randint(0, 10)}}]})
+            return {'stats': stats}
+        match = re.search(r"/game/(\d+)/winProbability$", path)
+        if match:
+            return stub_win_probability(int(match.group(1)))
+        if path.endswith("/attendance"):
+            rng = random.Random(query.get('season'))
+            return {'records': [{'team': team, 'attendanceTotalHome': 81 * (average := rng.randint(15000, 45000)),
+                                 'attendanceAverageHome': average} for team in teams]}
+        if path.endswith("/schedule"):
+            return stub_schedule(teams, query)
+        if path.endswith("/standings"):
+            started = season_days(int(query.get('season', datetime.date.today().year)))[0] <= datetime.date.today()
+            records = []
+            for division in dashboard.division_names:
+                division_teams = [team for team in teams if dashboard.team_divisions[dashboard.statsapi_team_ids[team['id']]] == division]
+                records.append({'teamRecords': [
+                    {'team': team, 'wins': 95 - 7 * i, 'losses': 67 + 7 * i, 'winningPercentage': f"{(95 - 7 * i) / 162:.3f}"[1:],
+                     'gamesBack': '-' if i == 0 else f"{7.0 * i}", 'eliminationNumber': '-' if i == 0 else str(20 - 5 * i)}
+                    if started else
+                    {'team': team, 'wins': 0, 'losses': 0, 'winningPercentage': '.000', 'gamesBack': '-', 'eliminationNumber': '-'}
+                    for i, team in enumerate(division_teams)]})
+            return {'records': records}
+        return None
+
+
+# A season of statsapi schedule JSON: every team plays daily, games before today are Final.
+# Date and date-window queries are clamped to the season like statsapi's.
+def stub_schedule(teams, query):
+    today = datetime.date.today()
+    season = int(query.get('season', today.year))
+    opening, final = season_days(season)
+    start = datetime.date.fromisoformat(query.get('date') or query.get('startDate') or opening.isoformat())
+    end = datetime.date.fromisoformat(query.get('date') or query.get('endDate') or final.isoformat())
+    start, end = max(start, opening), min(end, final)
+    dates = []
+    day = start
+    while day <= end:
+        rng = random.Random(day.toordinal())
+        order = teams[:]
+        rng.shuffle(order)
+        games = []
+        for i in range(0, len(order), 2):
+            final = day < today
+            home_score, away_score = rng.randint(0, 9), rng.randint(0, 9)
+            game = {
+                'gamePk': day.toordinal() * 100 + i,
+                'officialDate': day.isoformat(),
+                'gameNumber': 1,
+                'status': {'abstractGameState': 'Final' if final else 'Preview', 'detailedState': 'Final' if final else 'Scheduled'},
+                'teams': {'home': {'team': order[i]}, 'away': {'team': order[i + 1]}},
+            }
+            if final:
+                game['teams']['home']['score'] = home_score + (home_score == away_score)
+                game['teams']['away']['score'] = away_score
+                game['linescore'] = {'currentInning': 9}
+            elif day == today:
+                game['status'] = {'abstractGameState': 'Live', 'detailedState': 'In Progress'}
+                game['linescore'] = stub_linescore(game['gamePk'])
+            games.append(game)
+        dates.append({'date': day.isoformat(), 'games': games})
+        day += datetime.timedelta(days=1)
+    return {'dates': dates}
+
+
+# Linescore of a game in progress. Today's games started when the stub server did and a play
+# happens every STUB_PLAY_SECONDS, so a live panel sees outs, innings and runs change.
+STUB_PLAY_SECONDS = 3
+STUB_STARTED = time.time()
+
+def stub_plays(game_pk):
+    plays = int((time.time() - STUB_STARTED) / STUB_PLAY_SECONDS)
+    rng = random.Random(game_pk)
+    # One run in roughly every fourth play, alternating with the half inning being played
+    runs = {'away': 0, 'home': 0}
+    for play in range(plays):
+        if rng.random() < 0.25:
+            runs['home' if play // 3 % 2 else 'away'] += 1
+    return plays, runs
+
+def stub_linescore(game_pk):
+    plays, runs = stub_plays(game_pk)
+    half_innings = plays // 3
+    inning = half_innings // 2 + 1
+    ordinal = {1: "1st", 2: "2nd", 3: "3rd"}.get(inning, f"{inning}th")
+    return {'currentInning': inning, 'currentInningOrdinal': ordinal, 'inningHalf': 'Bottom' if half_innings % 2 else 'Top',
+            'outs': plays % 3, 'teams': {side: {'runs': value} for side, value in runs.items()}}
+
+def stub_win_probability(game_pk):
+    plays, runs = stub_plays(game_pk)
+    lead = runs['home'] - runs['away']
+    return [{'atBatIndex': plays, 'homeTeamWinProbability': round(100 / (1 + np.exp(-0.6 * lead)), 1)}]
+
+
+# Import the dashboard package with its upstreams pointed at the fixtures and stub server, and
+# collect what the benchmarks call in one namespace
+def load_dashboard(latency, cache_dir):
+    os.environ["MLB_CACHE_DIR"] = str(cache_dir)
+    os.environ["MLB_PREFETCH_INTERVAL"] = "0"
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    os.environ["MLB_STATSAPI_BASE"] = f"http://127.0.0.1:{server.server_port}/api/v1"
+    os.environ["MLB_TEAM_LOGO_URL"] = f"http://127.0.0.1:{server.server_port}/team-logos/{{}}.svg"
+
+    sys.path.insert(0, str(ROOT))
+    from mlb_dashboard import app, assets, cache, charts, players, schedules, standings, team_stats, teams, upstream
+    dashboard = SimpleNamespace(
+        mlb_teams=teams.mlb_teams, statsapi_team_ids=teams.statsapi_team_ids,
+        division_names=teams.division_names, team_divisions=teams.team_divisions,
+        get_memory_cache=cache.get_memory_cache, get_http_validators=upstream.get_http_validators,
+        get_render_cache=charts.get_render_cache, get_team_assets_store=assets.get_team_assets_store,
+        get_team_data=team_stats.get_team_data, get_standings=standings.get_standings,
+        get_last_week=schedules.get_last_week, get_player_data_statsapi=players.get_player_data_statsapi,
+        make_benchmark_schedule=schedules.make_benchmark_schedule, convert_dates=schedules.convert_dates,
+        extract_colors_from_svg=assets.extract_colors_from_svg, figure_to_png=charts.figure_to_png,
+        make_spider=charts.make_spider, main=app.main, load_dashboard_data=app.load_dashboard_data,
+        get_league_schedule=schedules.get_league_schedule, standings_from_schedule=standings.standings_from_schedule,
+        verify_incremental_standings=standings.verify_incremental_standings,
+    )
+
+    StubHandler.latency = latency
+    StubHandler.dashboard = dashboard
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    # The fixtures stand in for the pybaseball module itself, so calls still go through the data
+    # source and can be recorded
+    fixtures = Fixtures(dashboard, latency)
+    sys.modules["pybaseball"] = SimpleNamespace(**{name: getattr(fixtures, name) for name in
+                                                   ['team_batting', 'team_pitching', 'standings', 'schedule_and_record',
+                                                    'batting_stats_bref', 'pitching_stats_bref']})
+    return dashboard
+
+
+# Forget everything cached in memory and on disk so the next call is a cold fetch
+def reset_caches(dashboard, cache_dir):
+    for cache in (dashboard.get_memory_cache(), dashboard.get_http_validators()):
+        cache.clear()
+    render_cache = dashboard.get_render_cache()
+    with render_cache["lock"]:
+        render_cache["charts"].clear()
+    for path in Path(cache_dir).rglob("*"):
+        if path.is_file():
+            path.unlink()
+    dashboard.get_team_assets_store()["mtime"] = None
+
+
+def percentiles(timings):
+    values = np.array(timings) * 1000
+    return {
+        'n': len(values),
+        'p50': round(float(np.percentile(values, 50)), 3),
+        'p95': round(float(np.percentile(values, 95)), 3),
+        'p99': round(float(np.percentile(values, 99)), 3),
+    }
+
+
+def measure(func, repeat, setup=None):
+    timings = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return percentiles(timings)
+
+
+# Each benchmark returns {name: percentiles}
+def bench_fetchers(dashboard, cache_dir, repeat):
+    year = bench_year()
+    cold = lambda: reset_caches(dashboard, cache_dir)
+    results = {}
+    for name, func in [
+        ("get_team_data", lambda: dashboard.get_team_data(year)),
+        ("get_standings", lambda: dashboard.get_standings(year)),
+        ("get_last_week", lambda: dashboard.get_last_week(year, "Chicago Cubs")),
+    ]:
+        results[f"{name} cold"] = measure(func, repeat, setup=cold)
+        func()
+        results[f"{name} warm"] = measure(func, repeat)
+    results["get_player_data_statsapi"] = measure(lambda: dashboard.get_player_data_statsapi(year), max(1, repeat // 5))
+    return results
+
+
+def bench_transforms(dashboard, repeat):
+    year = datetime.date.today().year - 1
+    schedules = [dashboard.make_benchmark_schedule(season) for season in range(year - 4, year + 1)]
+    spider_args = ([0.254, 0.321, 0.412], ['AVG', 'OBP', 'SLG'], '#0E3386', "Batting Metrics")
+    return {
+        "convert_dates 5 seasons x 30 teams": measure(lambda: [dashboard.convert_dates(frame, year) for frame in schedules], repeat),
+        "extract_colors_from_svg": measure(lambda: dashboard.extract_colors_from_svg(SAMPLE_SVG * 50), repeat),
+        "make_spider render": measure(lambda: dashboard.figure_to_png(dashboard.make_spider, *spider_args, league_avg=[0.25, 0.32, 0.41]), repeat),
+    }
+
+
+def bench_page(dashboard, cache_dir, sessions, repeat):
+    reset_caches(dashboard, cache_dir)
+    if FIXTURE_SEASON == "past":
+        # The page renders the current season, for last season time loading its data
+        load = lambda: dashboard.load_dashboard_data(bench_year(), "Chicago Cubs")
+        return {"page data cold": measure(load, 1), "page data warm": measure(load, repeat)}
+    results = {"page cold": measure(dashboard.main, 1)}
+    results["page warm"] = measure(dashboard.main, repeat)
+
+    # N simulated sessions rendering at once against the warm caches
+    timings = []
+    def session(_):
+        start = time.perf_counter()
+        dashboard.main()
+        return time.perf_counter() - start
+    with ThreadPoolExecutor(max_workers=sessions) as pool:
+        for _ in range(repeat):
+            timings.extend(pool.map(session, range(sessions)))
+    results[f"page warm x{sessions} sessions"] = percentiles(timings)
+    return results
+
+
+# Correctness checks, each returns True when it passes
+
+# Seed the standings sync state as if the last sync was days before the latest finished game, so
+# the forced sync in verify_incremental_standings applies those days as deltas before it's
+# compared with a full rebuild
+def check_incremental_standings(dashboard, cache_dir, days=3):
+    reset_caches(dashboard, cache_dir)
+    year = datetime.date.today().year
+    schedule = dashboard.get_league_schedule(year)
+    finished = schedule.index.get_level_values('Date')[schedule['W/L'].notna()]
+    synced_through = (finished.max().date() if len(finished) else datetime.date.today()) - datetime.timedelta(days=days)
+    schedule = schedule[schedule.index.get_level_values('Date') <= pd.Timestamp(synced_through)]
+    dashboard.get_memory_cache()[f"standings_state_{year}"] = {
+        "synced_at": time.time(),
+        "synced_through": synced_through,
+        "schedule": schedule,
+        "applied": set(schedule.loc[schedule['W/L'].notna(), 'gamePk']),
+        "standings": dashboard.standings_from_schedule(schedule, synced_through),
+    }
+    return dashboard.verify_incremental_standings(year)
+
+
+def run_checks(dashboard, cache_dir):
+    checks = {}
+    # The incremental sync only runs for the current season
+    if FIXTURE_SEASON == "current":
+        checks["incremental standings match a full rebuild"] = lambda: check_incremental_standings(dashboard, cache_dir)
+    failures = []
+    for name, check in checks.items():
+        passed = check()
+        print(f"{'ok    ' if passed else 'FAILED'} {name}")
+        if not passed:
+            failures.append(name)
+    return failures
+
+
+def current_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+# Compare p50/p95 with a baseline run, anything slower by more than threshold is a regression
+def compare(results, baseline, threshold):
+    regressions = []
+    for name, stats in results.items():
+        before = baseline.get(name)
+        if not before:
+            continue
+        for metric in ('p50', 'p95'):
+            if before[metric] > 0 and stats[metric] > before[metric] * (1 + threshold):
+                regressions.append(f"{name} {metric}: {before[metric]:.1f} ms -> {stats[metric]:.1f} ms")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--only", choices=["fetchers", "transforms", "page", "checks"], action="append", help="Run only these groups")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--sessions", type=int, default=10, help="Concurrent simulated sessions for the page benchmark")
+    parser.add_argument("--latency", type=float, default=0.05, help="Simulated upstream latency per request, in seconds")
+    parser.add_argument("--baseline", type=Path, help="Results file to compare with, defaults to the latest other run")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed slowdown before a result counts as a regression")
+    parser.add_argument("--season", choices=SEASONS, default="current", help="Season the fixtures stand for")
+    snapshots = parser.add_mutually_exclusive_group()
+    snapshots.add_argument("--record", type=Path, metavar="DIR", help="Record every upstream response to DIR")
+    snapshots.add_argument("--replay", type=Path, metavar="DIR", help="Serve upstream data from snapshots in DIR instead of the fixtures")
+    args = parser.parse_args(argv)
+    if args.record or args.replay:
+        os.environ["MLB_DATA_SOURCE"] = "record" if args.record else "replay"
+        os.environ["MLB_SNAPSHOT_DIR"] = str(args.record or args.replay)
+    groups = args.only or ["fetchers", "transforms", "page", "checks"]
+    global FIXTURE_SEASON
+    FIXTURE_SEASON = args.season
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        dashboard = load_dashboard(args.latency, cache_dir)
+        results = {}
+        if "fetchers" in groups:
+            results.update(bench_fetchers(dashboard, cache_dir, args.repeat))
+        if "transforms" in groups:
+            results.update(bench_transforms(dashboard, args.repeat))
+        if "page" in groups:
+            results.update(bench_page(dashboard, cache_dir, args.sessions, args.repeat))
+        failures = run_checks(dashboard, cache_dir) if "checks" in groups else []
+
+    # A checks-only run has no timings to store or compare
+    if not results:
+        return 1 if failures else 0
+
+    print(f"{'benchmark':45} {'n':>5} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10}")
+    for name, stats in results.items():
+        print(f"{name:45} {stats['n']:>5} {stats['p50']:>10.2f} {stats['p95']:>10.2f} {stats['p99']:>10.2f}")
+
+    # Each season's results are kept and compared separately, e.g. bench_results/abc1234-preseason.json
+    commit = current_commit()
+    output = RESULTS_DIR / (f"{commit}.json" if args.season == "current" else f"{commit}-{args.season}.json")
+    baseline_path = args.baseline
+    if baseline_path is None and RESULTS_DIR.exists():
+        previous = sorted((path for path in RESULTS_DIR.glob("*.json")
+                           if path != output and json.loads(path.read_text()).get('season', 'current') == args.season),
+                          key=lambda path: path.stat().st_mtime)
+        baseline_path = previous[-1] if previous else None
+
+    RESULTS_DIR.mkdir(exist_ok=True)
+    output.write_text(json.dumps({'commit': commit, 'time': datetime.datetime.now().isoformat(timespec='seconds'),
+                                  'latency': args.latency, 'season': args.season, 'results': results}, indent=2))
+    print(f"\nResults written to {output}")
+
+    if baseline_path is not None:
+        baseline = json.loads(baseline_path.read_text())
+        regressions = compare(results, baseline['results'], args.threshold)
+        print(f"Compared with {baseline_path.name} ({baseline['commit']}): {len(regressions)} regression(s)")
+        for regression in regressions:
+            print(f"  {regression}")
+        return 1 if regressions or failures else 0
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,2 @@
+# MLB team dashboard. mlb-dashboard_2c.py is the Streamlit entry point, the app itself is in
+# app.py and the data, charts and background jobs are in the modules next to it.
@@ -0,0 +1,99 @@
+import pandas as pd
+import numpy as np
+
+from mlb_dashboard.cache import derived_snapshot
+from mlb_dashboard.team_stats import get_team_data
+from mlb_dashboard.teams import division_names, team_abbreviation, team_divisions
+
+# KPIs of the team comparison table, from the standings and team_data
+comparison_columns = ['W', 'L', 'W-L%', 'Run Diff', 'WAR', 'AVG', 'OBP', 'SLG', 'ERA', 'FIP', 'WHIP']
+
+# Team stats where a lower value is better. Their percentiles are flipped so 100 is always best.
+lower_is_better = {'ERA', 'FIP', 'xFIP', 'SIERA', 'WHIP', 'RA', 'ER', 'BB/9', 'HR/9', 'L', 'SO', 'K%', 'CS', 'GDP'}
+
+# Percentile (0-100) of each value in a column against that column's league values: the
+# league-worst value is 0 and the league-best 100, with tied teams sharing their average rank
+def percentile_against(league_values, values):
+    league_values = np.sort(league_values[~np.isnan(league_values)])
+    if len(league_values) < 2:
+        return np.full(len(values), 50.0)
+    below = np.searchsorted(league_values, values, side='left')
+    at_or_below = np.searchsorted(league_values, values, side='right')
+    rank = (below + at_or_below + 1) / 2
+    return np.clip(100 * (rank - 1) / (len(league_values) - 1), 0, 100)
+
+# Division and MLB means and medians of every numeric team stat, and percentiles of each team and
+# each average against the league, all computed in one pass per season
+def build_team_aggregates(team_data):
+    values = team_data.select_dtypes('number').astype(float)
+    abbrs = pd.Series([team_abbreviation(team) for team in values.index], index=values.index)
+    divisions = abbrs.map(team_divisions)
+
+    grouped = values.groupby(divisions)
+    mean = pd.concat([grouped.mean(), values.mean().to_frame('MLB').T])
+    median = pd.concat([grouped.median(), values.median().to_frame('MLB').T])
+    order = [name for name in division_names if name in mean.index] + ['MLB']
+    mean, median = mean.loc[order], median.loc[order]
+
+    # Percentiles of the teams and of the averages, in one table
+    points = pd.concat([values, mean])
+    percentile = pd.DataFrame({col: percentile_against(values[col].to_numpy(), points[col].to_numpy()) for col in values.columns},
+                              index=points.index)
+    flipped = percentile.columns.intersection(list(lower_is_better))
+    percentile[flipped] = 100 - percentile[flipped]
+
+    return {
+        "values": values,
+        "rows": dict(zip(abbrs, abbrs.index)),
+        "divisions": dict(zip(abbrs, divisions)),
+        "mean": mean,
+        "median": median,
+        "percentile": percentile,
+        # Row dicts of the same tables, so a page render only does dict lookups
+        "lookup": {name: frame.to_dict('index') for name, frame in (("values", values), ("mean", mean), ("percentile", percentile))},
+    }
+
+# A season's aggregates, built once per team data snapshot and shared by every session
+def get_team_aggregates(year):
+    team_data = get_team_data(year)
+    return derived_snapshot(f"team_aggregates_{year}", team_data, lambda: build_team_aggregates(team_data))
+
+# Comparison KPIs of every club, indexed by abbreviation. The table is built for all 30 clubs
+# in one pass, so comparing more teams is only a bigger row selection.
+def build_team_comparison(aggregates, standings):
+    values = aggregates["values"].rename(index={label: abbr for abbr, label in aggregates["rows"].items()})
+    record = standings.set_axis([team_abbreviation(team) for team in standings['Tm']])
+    kpis = pd.DataFrame({
+        'W': pd.to_numeric(record['W'], errors='coerce'),
+        'L': pd.to_numeric(record['L'], errors='coerce'),
+        'W-L%': pd.to_numeric(record['W-L%'], errors='coerce'),
+    }).reindex(values.index)
+    if {'R', 'RA'} <= set(values.columns):
+        kpis['Run Diff'] = values['R'] - values['RA']
+    kpis = kpis.join(values[values.columns.intersection(comparison_columns).difference(kpis.columns)])
+    kpis = kpis[[col for col in comparison_columns if col in kpis.columns]].round({'WAR': 1})
+    return kpis.astype({col: 'Int64' for col in ('W', 'L', 'Run Diff') if col in kpis.columns})
+
+# A season's comparison table, rebuilt when either the team data or the standings snapshot changes
+def get_team_comparison(year, standings):
+    aggregates = get_team_aggregates(year)
+    return derived_snapshot(f"team_comparison_{year}", (aggregates["values"], standings),
+                            lambda: build_team_comparison(aggregates, standings))
+
+# Values of some stats for several teams, raw or as percentiles, selected in one lookup, with the
+# league average to draw alongside
+def comparison_series(aggregates, abbrs, metrics, percentiles=False):
+    frame = aggregates["percentile"] if percentiles else aggregates["values"]
+    rows = frame.loc[[aggregates["rows"][abbr] for abbr in abbrs], metrics].to_numpy().tolist()
+    league = (aggregates["percentile"] if percentiles else aggregates["mean"]).loc['MLB', metrics].tolist()
+    return dict(zip(abbrs, rows)), league
+
+# Team, division average and league average values of some stats for a spider chart, raw or as
+# percentiles. The division average is None when the team's division isn't known.
+def spider_series(aggregates, abbr, metrics, percentiles=False):
+    lookup = aggregates["lookup"]
+    averages = lookup["percentile"] if percentiles else lookup["mean"]
+    team_values = (lookup["percentile"] if percentiles else lookup["values"])[aggregates["rows"][abbr]]
+    division = averages.get(aggregates["divisions"].get(abbr))
+    division_avg = [division[metric] for metric in metrics] if division else None
+    return [team_values[metric] for metric in metrics], division_avg, [averages['MLB'][metric] for metric in metrics]
@@ -0,0 +1,418 @@
+import streamlit as st
+import pandas as pd
+import numpy as np
+import datetime
+import time
+
+from mlb_dashboard.config import DEBUG_SIDEBAR, METRICS_FILE, METRICS_PORT, PREFETCH_INTERVAL
+from mlb_dashboard.schedules import convert_dates, get_last_week, get_schedule
+from mlb_dashboard.metrics import count, metrics_frames, metrics_text, record_timing, start_metrics_server, timed, write_metrics
+from mlb_dashboard.standings import get_standings, sync_standings
+from mlb_dashboard.teams import get_team_abbreviation, mlb_teams, team_abbreviation
+from mlb_dashboard.assets import get_team_assets
+from mlb_dashboard.team_stats import get_team_data
+from mlb_dashboard.prefetch import start_prefetch_scheduler
+from mlb_dashboard.splits import get_team_splits
+from mlb_dashboard.aggregates import comparison_series, get_team_aggregates, get_team_comparison, spider_series
+from mlb_dashboard.cache import derived_snapshot
+from mlb_dashboard.leaderboards import get_leaderboard, get_leaderboards, leaderboard_metrics
+from mlb_dashboard.live import show_live_game, start_live_poller
+from mlb_dashboard.projections import get_season_projection
+from mlb_dashboard.trends import franchise_trend, trend_metrics
+
+hide_streamlit_style = """
+<style>
+    #root > div:nth-child(1) > div > div > div > div > section > div {padding-top: 2.6rem;}
+</style>
+"""
+
+# Load everything a dashboard page needs for one team and season. Each dataset is fetched
+# and converted once, and the returned dict is shared by every panel on the page.
+def load_dashboard_data(year, team):
+    abbr = get_team_abbreviation(team)
+    with timed("mlb_fetch_seconds", fetcher="team_assets"):
+        team_assets = get_team_assets(abbr)
+
+    # The current season's standings and 7-day record are kept up to date incrementally
+    standings_data = None
+    last_week = None
+    if int(year) == datetime.datetime.now().year:
+        try:
+            with timed("mlb_fetch_seconds", fetcher="standings_sync"):
+                standings_data = sync_standings(year)
+            team_row = standings_data.loc[abbr]
+            last_week = (team_row['Last7 W'], team_row['Last7 L'], team_row['Streak'])
+        except Exception as e:
+            print(f"Error syncing standings from statsapi: {e}")
+            count("mlb_fallbacks", dataset="standings_sync", source="pybaseball")
+            standings_data = None
+    if standings_data is None:
+        standings_data = get_standings(year)
+
+    # Dates are converted once per schedule snapshot, so the splits can tell when it changed
+    raw_schedule = get_schedule(year, abbr)
+    schedule = derived_snapshot(f"schedule_dates_{year}_{abbr}", raw_schedule, lambda: convert_dates(raw_schedule, year))
+
+    return {
+        "year": year,
+        "team": team,
+        "abbr": abbr,
+        "team_id": team_assets["id"],
+        "logo_url": team_assets["logo_url"],
+        "logo_b64": team_assets["logo_b64"],
+        "logo_error": team_assets["error"],
+        "logo_svg": team_assets["svg"],
+        "main_colors": team_assets["colors"],
+        "team_data": get_team_data(year),
+        "standings": standings_data,
+        "last_week": last_week,
+        "schedule": schedule,
+        "splits": get_team_splits(year, abbr, schedule),
+    }
+
+# Streamlit app
+def main():
+    # Set page config at the very beginning
+    st.set_page_config(layout="wide", page_title="MLB Team Dashboard", page_icon="⚾", initial_sidebar_state="collapsed")
+    page_start = time.perf_counter()
+
+    st.markdown(hide_streamlit_style, unsafe_allow_html=True)
+
+    #load_bootstrap()
+
+    # Call style.css
+    #with open('style.css') as f:
+    #    st.markdown(f'<style>{f.read()}</style>', unsafe_allow_html=True)
+
+    # Keep the current season warm in the background so visitors are served from the cache
+    if PREFETCH_INTERVAL > 0:
+        start_prefetch_scheduler()
+    if METRICS_PORT > 0:
+        start_metrics_server()
+
+    # Set default team (e.g., to Chicago Cubs, if available)
+    default_team = "Chicago Cubs" if "Chicago Cubs" in mlb_teams.values() else list(mlb_teams.values())[0]
+
+
+    # Sidebar for team selection
+    st.sidebar.title("MLB Team Dashboard")
+    year = st.sidebar.selectbox("Select Year", range(datetime.datetime.now().year, 2000, -1))
+    selected_team = st.sidebar.selectbox("Select a Team", list(mlb_teams.values()), index=list(mlb_teams.values()).index(default_team))
+    percentile_axes = st.sidebar.checkbox("Spider charts as league percentiles", help="100 is the best team in MLB and 0 the worst for every stat")
+    live_mode = year == datetime.datetime.now().year and st.sidebar.toggle("Live game", help="Follow today's game, the score updates without reloading the page")
+
+    # Get data, each dataset is fetched and converted once and shared by every panel
+    with timed("mlb_panel_seconds", panel="data"):
+        dashboard_data = load_dashboard_data(year, selected_team)
+    logo_url = dashboard_data["logo_url"]
+    main_colors = dashboard_data["main_colors"]
+    if dashboard_data["logo_error"]:
+        st.error(f"Failed to fetch logo: {dashboard_data['logo_error']}")
+
+    alt_main_colors = ['#D3D3D3' if color.lower() == '#ffffff' else color for color in main_colors]
+
+    with timed("mlb_panel_seconds", panel="header"):
+        col1, col2 = st.columns((1,3))
+        with col2:
+            st.title(f"{selected_team} Team Dashboard")
+        with col1:
+            if dashboard_data["logo_b64"]:
+                st.markdown(f"<img src='data:image/svg+xml;base64,{dashboard_data['logo_b64']}' height='100'>", unsafe_allow_html=True)
+            else:
+                st.markdown(f"<img src={logo_url} height='100'>", unsafe_allow_html=True)
+
+    # The live panel is a fragment, its timer reruns only the panel and not the rest of the page
+    if live_mode:
+        start_live_poller()
+        show_live_game(dashboard_data["team_id"])
+
+    with timed("mlb_panel_seconds", panel="kpis"):
+        team_data = dashboard_data["team_data"]
+        #batting_data, pitching_data = get_player_data(year)
+        standings_data = dashboard_data["standings"]
+        last_week_data = dashboard_data["last_week"] or get_last_week(year,selected_team,dashboard_data["schedule"])
+
+        #col_names = team_data.columns 
+        #for names in col_names:
+        #    if names == 'RA':
+        #        print(names)
+        #print(team_data.head())
+
+        # Team-level KPIs
+        #st.header(f"{selected_team} KPIs for {year}")
+
+        # Find the row for the selected team
+        team_row = standings_data[standings_data['Tm'] == selected_team]
+        team_abv = next(k for k, v in mlb_teams.items() if v == selected_team)
+        #print(team_abv)
+        #print(team_data.index)
+        team_data_row = team_data[[team_abbreviation(team) == team_abv for team in team_data.index]]
+
+        # Create three columns for metrics
+        col1, col2, col3, col4, col5, col6, col7, col8, col9, col10 = st.columns((2,2,2,2,2,2,2,2,2,2))
+
+        with col1:
+            st.header(f"{year}")
+
+        with col2:
+            st.metric("Wins", int(team_row['W'].values[0]), delta = int(last_week_data[0]), help="The delta is for the last 7 days.")
+        
+        with col3:
+            st.metric("Losses", int(team_row['L'].values[0]), delta = int(last_week_data[1]), help="The delta is for the last 7 days.", delta_color = "inverse")
+            #       st.metric("RBI", rbi)
+    #
+        with col4:
+            oldW = int(team_row['W'].values[0])-int(last_week_data[0])
+            oldL = int(team_row['L'].values[0])-int(last_week_data[1])
+            # No delta in the first week of the season, there's no earlier record to compare with
+            delta_WLperc = None
+            if oldW + oldL > 0:
+                old_WLperc = (oldW)/(oldW+oldL)
+                #print(old_WLperc, int(team_row['W'].values[0]), int(last_week_data[0]), int(team_row['L'].values[0]), int(last_week_data[1]))
+                delta_WLperc = "{:.3f}".format(float(team_row['W-L%'].values[0]) - float(old_WLperc))
+            #print(old_WLperc, delta_WLperc)
+            st.metric("Win %", team_row['W-L%'].values[0], delta = delta_WLperc, help="The delta is for the last 7 days.")
+    #        st.metric("Fielding %", f"{fielding_pct:.3f}")
+
+        with col5:
+            st.metric("Streak", last_week_data[2])
+    
+        with col6:
+            st.metric("Games Behind", team_row['GB'].values[0], delta=None)
+
+        with col7:
+            if team_row['E#'].values[0] == 'E':
+                elim_help="Team is Eliminated from Division Contention"
+            elif team_row['E#'].values[0] == '☠':
+                elim_help="Team is Eliminated from Playoff Contention"
+            else:
+                elim_help="Number of wins/loses to be eliminated."
+
+            #print(team_row["E#"].values[0])
+            st.metric("Elim. #", team_row['E#'].values[0], delta= None, help=elim_help)
+        
+        with col8:
+            run_diff = int(team_data_row['R'].iloc[0]) - int(team_data_row['RA'].iloc[0])
+            st.metric("Run Differential", run_diff, delta=None)
+
+        with col9:
+            # WAR is FanGraphs only, it's empty when the team stats came from the statsapi fallback
+            war = pd.to_numeric(team_data_row['WAR'], errors='coerce').iloc[0] if 'WAR' in team_data_row else None
+            st.metric("WAR", round(float(war), 1) if pd.notna(war) else "-", delta=None)
+
+        with col10:
+            st.metric("Batting Ave.", round(float(team_data_row["AVG"].iloc[0]), 3), delta = None)
+
+
+
+        from streamlit_extras.metric_cards import style_metric_cards
+        style_metric_cards(background_color=main_colors[2],border_color=main_colors[0],border_left_color=main_colors[1],border_size_px=3)
+
+    # Odds for the rest of the current season, simulated once per standings snapshot
+    if int(year) == datetime.datetime.now().year:
+        with st.expander("Playoff odds"), timed("mlb_panel_seconds", panel="projection"):
+            show_season_projection(year, team_abv, standings_data)
+
+    with timed("mlb_panel_seconds", panel="chart_inputs"):
+        # matplotlib and seaborn load here, after the header and KPI cards have been sent
+        from mlb_dashboard.charts import make_home_away_chart, make_record_chart, make_spider, submit_chart
+        col1, col2, col3, col4 = st.columns((0.5,0.5,0.4,0.4))
+
+        # Win-Loss Record
+        schedule_df = dashboard_data["schedule"].copy()
+        # Rows up to the first game on the latest date that isn't after today: the whole schedule
+        # for a finished season, none in the preseason
+        dates = schedule_df['Date'].dt.normalize()
+        played = dates <= pd.Timestamp(datetime.datetime.now().date())
+        today_position = int((dates == dates[played].max()).to_numpy().argmax()) + 1 if played.any() else 0
+        schedule_df = schedule_df.iloc[:today_position]
+        # First, let's create columns for wins and losses
+        schedule_df['Win'] = np.where(schedule_df['W/L'] == 'W', 1, 0)
+        schedule_df['Loss'] = np.where(schedule_df['W/L'] == 'L', 1, 0)
+        # Now, let's create the cumulative columns
+        schedule_df['Cumulative_Wins'] = schedule_df['Win'].cumsum()
+        schedule_df['Cumulative_Losses'] = schedule_df['Loss'].cumsum()
+        record_chart = submit_chart("record", make_record_chart, schedule_df[['Date', 'Cumulative_Wins', 'Cumulative_Losses', 'Attendance']], alt_main_colors)
+
+        # Home and away record from the team's split totals. The splits are empty until the
+        # team's first game is final, e.g. on opening day.
+        home_away_chart = None
+        if 'Location' in dashboard_data["splits"].index.unique('Split'):
+            location = dashboard_data["splits"].loc['Location']
+            HomeAway_df = pd.DataFrame({
+                'Location': location.index,
+                'Wins': location['W'].values,
+                'Losses': location['L'].values
+            })
+            home_away_chart = submit_chart("home_away", make_home_away_chart, HomeAway_df, alt_main_colors)
+
+        # Division and league averages (or league percentiles) come precomputed once per season
+        aggregates = get_team_aggregates(year)
+
+        metrics = ['AVG', 'OBP', 'SLG']
+        values, division_avg, league_avg = spider_series(aggregates, team_abv, metrics, percentile_axes)
+        batting_chart = submit_chart("spider", make_spider, values=values, labels=metrics, title="Batting Metrics",
+                                     color=alt_main_colors[0], division_avg=division_avg,
+                                     league_avg=league_avg, percentiles=percentile_axes)
+
+        # Define the metrics and their values
+        metrics = ['ERA', 'FIP', 'WHIP']
+        values, division_avg, league_avg = spider_series(aggregates, team_abv, metrics, percentile_axes)
+        pitching_chart = submit_chart("spider", make_spider, values=values, labels=metrics, title="Pitching Metrics",
+                                      color=alt_main_colors[1], division_avg=division_avg,
+                                      league_avg=league_avg, percentiles=percentile_axes)
+
+    # All four charts render on the worker pool, each column waits only for its own
+    with col1, timed("mlb_panel_seconds", panel="record_chart"):
+        st.image(record_chart.result(), width="stretch")
+
+    with col2, timed("mlb_panel_seconds", panel="home_away_chart"):
+        if home_away_chart is not None:
+            st.image(home_away_chart.result(), width="stretch")
+        else:
+            st.caption("No home or away games played yet.")
+
+    with col3, timed("mlb_panel_seconds", panel="batting_chart"):
+        st.image(batting_chart.result(), width="stretch")
+
+    with col4, timed("mlb_panel_seconds", panel="pitching_chart"):
+        st.image(pitching_chart.result(), width="stretch")
+
+    with st.expander("Record splits"), timed("mlb_panel_seconds", panel="splits"):
+        splits = dashboard_data["splits"]
+        if splits.empty:
+            st.caption("No games played yet.")
+        else:
+            split = st.radio("Split", list(splits.index.unique('Split')), horizontal=True, label_visibility="collapsed")
+            st.dataframe(splits.loc[split], width="stretch")
+
+    with st.expander("Compare teams"), timed("mlb_panel_seconds", panel="comparison"):
+        show_team_comparison(year, team_abv, dashboard_data["standings"], percentile_axes)
+
+    # Team Batting
+    #st.subheader("Team Batting")
+    #if 'OPS' in team_data.columns and 'R' in team_data.columns and 'HR' in team_data.columns:
+    #    fig_batting = px.scatter(team_data, x='OPS', y='R', hover_name=team_data.index, 
+    #                             size='HR', title="Team OPS vs Runs Scored")
+    #    st.plotly_chart(fig_batting)
+    #else:
+    #    st.write("Required batting data not available for the selected year.")
+
+    # Team Pitching
+    #st.subheader("Team Pitching")
+    #if 'ERA' in team_data.columns and 'WHIP' in team_data.columns and 'SO' in team_data.columns:
+    #    fig_pitching = px.scatter(team_data, x='ERA', y='WHIP', hover_name=team_data.index, 
+    #                              size='SO', title="Team ERA vs WHIP")
+    #    st.plotly_chart(fig_pitching)
+    #else:
+    #    st.write("Required pitching data not available for the selected year.")
+
+    with st.expander("Franchise trends"), timed("mlb_panel_seconds", panel="trends"):
+        show_franchise_trends(team_abv)
+
+    # Player-level KPIs, ranked once per season by the leaderboard store
+    with timed("mlb_panel_seconds", panel="leaderboards"):
+        show_leaderboards(year, team_abv)
+
+    record_timing("mlb_page_seconds", time.perf_counter() - page_start)
+    if METRICS_FILE:
+        write_metrics(METRICS_FILE)
+    if DEBUG_SIDEBAR or st.query_params.get("debug") == "1":
+        show_debug_sidebar()
+
+# The team's projected record and division, wild card and playoff odds, with its league's table
+def show_season_projection(year, abbr, standings_data):
+    try:
+        projection = get_season_projection(year, standings_data)
+    except Exception as e:
+        print(f"Error projecting the season: {e}")
+        st.write("Playoff odds are not available right now.")
+        return
+
+    odds = projection["odds"]
+    team = odds.loc[abbr]
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Projected Record", f"{team['Proj W']:.0f}-{team['Proj L']:.0f}")
+    col2.metric("Division Odds", f"{team['Division %']:.1f}%")
+    col3.metric("Wild Card Odds", f"{team['Wild Card %']:.1f}%")
+    col4.metric("Playoff Odds", f"{team['Playoff %']:.1f}%")
+    st.dataframe(odds[odds['Division'].str[:2] == team['Division'][:2]], width="stretch")
+    st.caption(f"{projection['simulations']:,} simulations of the {projection['games']} remaining games. Each game is a "
+               "log5 matchup of the teams' Pythagorean records (from runs scored and allowed) with home field, ties are broken at random.")
+
+# KPIs and overlaid spider charts for several clubs. The table for all 30 clubs is built once per
+# team data and standings snapshot, so each added team is one more selected row and no fetches.
+def show_team_comparison(year, abbr, standings_data, percentiles=False):
+    abbrs = st.multiselect("Teams", list(mlb_teams), default=[abbr], format_func=mlb_teams.get, label_visibility="collapsed")
+    if not abbrs:
+        st.write("Pick teams to compare.")
+        return
+    aggregates = get_team_aggregates(year)
+    comparison = get_team_comparison(year, standings_data)
+    st.dataframe(comparison.reindex(abbrs), width="stretch")
+    if len(abbrs) < 2:
+        return
+
+    from mlb_dashboard.charts import make_comparison_spider, submit_chart
+    charts = []
+    for metrics, title in ((['AVG', 'OBP', 'SLG'], "Batting Metrics"), (['ERA', 'FIP', 'WHIP'], "Pitching Metrics")):
+        series, league_avg = comparison_series(aggregates, abbrs, metrics, percentiles)
+        charts.append(submit_chart("comparison_spider", make_comparison_spider, series, metrics, title,
+                                   league_avg=league_avg, percentiles=percentiles))
+    for col, chart in zip(st.columns(2), charts):
+        col.image(chart.result(), width="stretch")
+
+# A stat per season or per month across every season in the rollup store, for the franchise
+# (moved clubs included, e.g. the Expos years for Washington)
+def show_franchise_trends(abbr):
+    col1, col2 = st.columns((1, 3))
+    by = col1.radio("Trend", ["season", "month"], format_func=lambda by: f"By {by}", label_visibility="collapsed")
+    try:
+        trend = franchise_trend(abbr, by)
+    except Exception as e:
+        print(f"Error loading the trend rollups: {e}")
+        trend = None
+    if trend is None:
+        st.write("No seasons have been rolled up yet, build them with `python mlb-dashboard_2c.py trends build`.")
+        return
+
+    metrics = [metric for metric in trend_metrics if metric in trend.columns and trend[metric].notna().any()]
+    metric = col2.selectbox("Stat", metrics, label_visibility="collapsed")
+    if by == "month":
+        trend = trend.set_axis([f"{season}-{month:02d}" for season, month in trend.index])
+    st.line_chart(trend[metric], y_label=metric)
+
+# Top batters and pitchers for the selected club or all of MLB. Each table is a lookup into
+# leaderboards built once per season snapshot.
+def show_leaderboards(year, abbr):
+    try:
+        available = get_leaderboards(year)
+    except Exception as e:
+        print(f"Error loading player stats: {e}")
+        st.write(f"Player stats are not available for {year}.")
+        return
+
+    st.header("Player-level KPIs")
+    scope = st.radio("Leaders", [mlb_teams[abbr], "MLB"], horizontal=True, label_visibility="collapsed")
+    team = None if scope == "MLB" else abbr
+    col1, col2 = st.columns(2)
+    for col, source, label in ((col1, 'batting', "Top Batters"), (col2, 'pitching', "Top Pitchers")):
+        metrics = [metric for metric, (group, _, _) in leaderboard_metrics.items() if group == source and metric in available]
+        with col:
+            if not metrics:
+                st.write(f"{source.title()} data not available for the selected year.")
+                continue
+            metric = st.selectbox(label, metrics, key=f"leaders_{source}")
+            st.dataframe(get_leaderboard(year, metric, team), hide_index=True, width="stretch")
+    st.caption("OPS, wRC+, ERA, FIP and WHIP leaders need 3.1 plate appearances or 1 inning pitched per team game.")
+
+# Timing spans and counters for this process, with the OpenMetrics text as a download
+def show_debug_sidebar():
+    counter_df, timing_df = metrics_frames()
+    with st.sidebar:
+        st.subheader("Debug")
+        st.caption("Timing spans in seconds, since the server started")
+        st.dataframe(timing_df.round(4), hide_index=True)
+        st.caption("Cache, fallback and upstream counters")
+        st.dataframe(counter_df, hide_index=True)
+        st.download_button("Download metrics", metrics_text(), file_name="mlb_dashboard_metrics.txt", mime="text/plain")
@@ -0,0 +1,142 @@
+import streamlit as st
+import requests
+import json
+import base64
+import re
+from collections import Counter
+import os
+import threading
+
+from mlb_dashboard.config import CACHE_DIR, DEFAULT_COLORS, TEAM_ASSETS_PATH, TEAM_LOGO_URL
+from mlb_dashboard.upstream import fetch_all, forget_validated_response, http_get
+from mlb_dashboard.teams import mlb_teams, statsapi_team_id_by_abbr
+
+def img_to_bytes(img_path):
+      img_bytes = http_get(img_path, revalidate=True)
+      encoded = base64.b64encode(img_bytes).decode()
+      return encoded
+
+def img_to_html(img_path):
+      img_html = "<img src='data:image/png;base64,{}' class='img-fluid' >".format(
+        img_to_bytes(img_path)
+      )
+      return img_html
+
+def extract_colors_from_svg(svg_content):
+    # Regular expression to find color values in SVG
+    color_pattern = re.compile(r'(?:fill|stroke)="(#[0-9A-Fa-f]{6})"')
+    colors = color_pattern.findall(svg_content)
+    
+    # Count occurrences of each color
+    color_counts = Counter(colors)
+    #print(color_counts)
+    
+    # Get the top 3 most common colors
+    main_colors = [color for color, _ in color_counts.most_common(3)]
+    #print(len(main_colors), main_colors)
+    
+    # If we have fewer than 3 colors, add white or black
+    if len(main_colors) < 2:
+        main_colors.append("#000000")
+        main_colors.append("#FFFFFF")
+    if len(main_colors) < 3:
+        if "#FFFFFF" not in main_colors:
+            main_colors.append("#FFFFFF")  # white
+        elif "#000000" not in main_colors:
+            main_colors.append("#000000")  # black
+        else:
+            main_colors = ["#000000","#777777","#FFFFFF"]
+    
+    #print(main_colors)
+    return main_colors[:3]
+
+# Local bundle of team branding (logo SVG, base64 logo, 3-color palette and team id) so pages
+# render without any network calls. It's filled lazily, or all at once with "assets build".
+@st.cache_resource
+def get_team_assets_store():
+    return {"lock": threading.Lock(), "mtime": None, "teams": {}}
+
+def load_team_assets():
+    store = get_team_assets_store()
+    # Reload when the bundle file was changed by another process, e.g. "assets invalidate"
+    mtime = TEAM_ASSETS_PATH.stat().st_mtime if TEAM_ASSETS_PATH.exists() else None
+    if mtime != store["mtime"]:
+        try:
+            store["teams"] = json.loads(TEAM_ASSETS_PATH.read_text()) if mtime else {}
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Error reading team assets: {e}")
+            store["teams"] = {}
+        store["mtime"] = mtime
+    return store
+
+def save_team_assets(store):
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp_path = TEAM_ASSETS_PATH.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(store["teams"]))
+    os.replace(tmp_path, TEAM_ASSETS_PATH)
+    store["mtime"] = TEAM_ASSETS_PATH.stat().st_mtime
+
+# Fetch one team's branding. The team id comes from the abbreviation, club names change upstream
+# (e.g. "Athletics"). Any failure is recorded in the asset's error so a build skips only that team.
+def build_team_asset(abbr):
+    name = mlb_teams[abbr]
+    team_id = statsapi_team_id_by_abbr[abbr]
+    asset = {
+        "abbr": abbr,
+        "name": name,
+        "id": team_id,
+        "logo_url": TEAM_LOGO_URL.format(team_id),
+        "svg": None,
+        "logo_b64": None,
+        "colors": DEFAULT_COLORS,
+        "error": None,
+    }
+    try:
+        logo_bytes = http_get(asset["logo_url"], revalidate=True)
+        asset["svg"] = logo_bytes.decode()
+        asset["logo_b64"] = base64.b64encode(logo_bytes).decode()
+        asset["colors"] = extract_colors_from_svg(asset["svg"]) or DEFAULT_COLORS
+    except requests.HTTPError as e:
+        asset["error"] = f"HTTP {e.response.status_code}"
+    except requests.RequestException as e:
+        asset["error"] = str(e)
+    except Exception as e:
+        asset["error"] = f"{type(e).__name__}: {e}"
+    return asset
+
+# Get one team's branding, fetching and storing it the first time it's asked for
+def get_team_assets(abbr):
+    store = load_team_assets()
+    if abbr in store["teams"]:
+        return store["teams"][abbr]
+    asset = build_team_asset(abbr)
+    if asset["error"] is None:
+        with store["lock"]:
+            store["teams"][abbr] = asset
+            save_team_assets(store)
+    return asset
+
+# Build step: fetch branding for all teams (or the given ones) and write the bundle
+def build_team_assets(abbrs=None):
+    abbrs = abbrs or list(mlb_teams)
+    built = fetch_all(build_team_asset, abbrs)
+    store = load_team_assets()
+    with store["lock"]:
+        for asset in built:
+            if asset["error"] is None:
+                store["teams"][asset["abbr"]] = asset
+            else:
+                print(f"Skipped {asset['abbr']}, error fetching its logo or colors: {asset['error']}")
+        save_team_assets(store)
+    return built
+
+# Drop bundled branding (all teams, or the given ones) e.g. after a club rebrands. The stored
+# logo validators go too, so the next build downloads the logos in full.
+def invalidate_team_assets(abbrs=None):
+    store = load_team_assets()
+    with store["lock"]:
+        for abbr in abbrs or list(store["teams"]):
+            asset = store["teams"].pop(abbr, None)
+            if asset:
+                forget_validated_response(asset["logo_url"])
+        save_team_assets(store)
@@ -0,0 +1,173 @@
+import streamlit as st
+import datetime
+import os
+import time
+import pickle
+import functools
+import threading
+from concurrent.futures import Future
+
+from mlb_dashboard.config import CACHE_DIR, CACHE_TTL, SEASON_END
+from mlb_dashboard.metrics import count, timed
+
+# Process-wide memory cache, kept by Streamlit across reruns and sessions
+@st.cache_resource
+def get_memory_cache():
+    return {}
+
+def read_disk_cache(key):
+    path = CACHE_DIR / f"{key}.pkl"
+    if not path.exists():
+        return None
+    try:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    except Exception as e:
+        print(f"Error reading cache file {path}: {e}")
+        return None
+
+def write_disk_cache(key, entry):
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        path = CACHE_DIR / f"{key}.pkl"
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "wb") as f:
+            pickle.dump(entry, f)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        print(f"Error writing cache file for {key}: {e}")
+
+def season_end(year):
+    return datetime.datetime(int(year), *SEASON_END).timestamp()
+
+def cache_is_fresh(year, saved_at, provisional=False):
+    # Past seasons are final once saved after the season ended, only the current season (or a past
+    # season saved while it was in progress) goes stale. A provisional value (a fallback source's)
+    # goes stale like the current season's, so the primary source is retried.
+    if int(year) < datetime.datetime.now().year and saved_at >= season_end(year) and not provisional:
+        return True
+    return time.time() - saved_at < CACHE_TTL
+
+# A frame built from a fallback source carries the source in attrs["fallback"]
+def is_fallback(value):
+    return getattr(value, "attrs", {}).get("fallback") is not None
+
+def clear_cache(name=None, year=None):
+    # Drop matching entries from memory and disk, e.g. clear_cache("standings", 2024)
+    prefix = "_".join(str(p) for p in (name, year) if p is not None)
+    memory = get_memory_cache()
+    for key in [k for k in memory if k.startswith(prefix)]:
+        del memory[key]
+    if CACHE_DIR.exists():
+        for path in CACHE_DIR.glob(f"{prefix}*.pkl"):
+            path.unlink(missing_ok=True)
+
+# Fetches in progress, keyed like the memory cache
+@st.cache_resource
+def get_inflight_fetches():
+    return {"lock": threading.Lock(), "futures": {}}
+
+# Single-flight: the first caller for a key runs fetch, everyone who asks for the same key
+# while it's running waits for that result instead of starting their own fetch
+def single_flight(key, fetch):
+    inflight = get_inflight_fetches()
+    with inflight["lock"]:
+        future = inflight["futures"].get(key)
+        leader = future is None
+        if leader:
+            future = Future()
+            inflight["futures"][key] = future
+    if not leader:
+        return future.result()
+    try:
+        value = fetch()
+        future.set_result(value)
+        return value
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with inflight["lock"]:
+            del inflight["futures"][key]
+
+# Decorator that caches a fetcher's result per season, first in memory and then on disk. The
+# memory cache is shared by every session in the process, so all callers get the same snapshot
+# of a dataset. Snapshots are treated as immutable: copy a frame before changing it. With
+# memory=False the result is only cached on disk, e.g. for a wide frame that's projected before
+# it's kept in memory.
+def season_cache(name, memory=True):
+    def decorator(func):
+        def cache_key(year, args):
+            return "_".join([name, str(year)] + [str(arg) for arg in args])
+
+        # With record=True the lookup is counted as a memory hit, disk hit, stale entry or miss
+        def cached_entry(key, year, record=False):
+            memory_cache = get_memory_cache() if memory else {}
+            entry = memory_cache.get(key)
+            layer = "memory"
+            if entry is None:
+                entry = read_disk_cache(key)
+                layer = "disk"
+                if entry is not None and memory:
+                    memory_cache[key] = entry
+            if entry is not None and cache_is_fresh(year, entry[0], provisional=is_fallback(entry[1])):
+                if record:
+                    count("mlb_cache_requests", cache=name, result=layer)
+                return entry
+            if record:
+                count("mlb_cache_requests", cache=name, result="stale" if entry is not None else "miss")
+            return None
+
+        def fetch_and_store(key, year, args):
+            with timed("mlb_fetch_seconds", fetcher=name):
+                value = func(year, *args)
+            entry = (time.time(), value)
+            if memory:
+                get_memory_cache()[key] = entry
+            write_disk_cache(key, entry)
+            return value
+
+        @functools.wraps(func)
+        def wrapper(year, *args):
+            key = cache_key(year, args)
+            entry = cached_entry(key, year, record=True)
+            if entry is not None:
+                return entry[1]
+
+            # Check again once we're the one fetching, another caller may have just finished
+            def fetch():
+                entry = cached_entry(key, year)
+                return entry[1] if entry is not None else fetch_and_store(key, year, args)
+            return single_flight(key, fetch)
+
+        # Fetch and store a new value even if the cached one is still fresh
+        def refresh(year, *args):
+            key = cache_key(year, args)
+            return single_flight(key, lambda: fetch_and_store(key, year, args))
+
+        wrapper.refresh = refresh
+        return wrapper
+    return decorator
+
+# Memoize a value derived from a cached snapshot (e.g. a compact projection) so sessions share
+# it too. It's rebuilt when the source snapshot is replaced. A value derived from several
+# snapshots passes them as a tuple and is rebuilt when any of them is replaced.
+def derived_snapshot(key, source, build):
+    memory = get_memory_cache()
+    sources = source if isinstance(source, tuple) else (source,)
+
+    def current():
+        entry = memory.get(key)
+        if entry is None or len(entry[0]) != len(sources) or any(a is not b for a, b in zip(entry[0], sources)):
+            return None
+        return entry[1]
+
+    def build_and_store():
+        value = current()
+        if value is None:
+            value = build()
+            memory[key] = (sources, value)
+        return value
+
+    value = current()
+    return value if value is not None else single_flight(key, build_and_store)
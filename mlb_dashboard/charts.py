@@ -0,0 +1,197 @@
+import streamlit as st
+import pandas as pd
+import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+import seaborn as sns
+import numpy as np
+import math
+import io
+from collections import OrderedDict
+import threading
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+
+from mlb_dashboard.config import RENDER_CACHE_SIZE, RENDER_WORKERS
+from mlb_dashboard.metrics import count, timed
+
+# Minimalist style settings for the seaborn and matplotlib charts
+sns.set(style="white", palette="muted")
+
+def hex_to_rgb(hex_color):
+    hex_color = hex_color.lstrip('#')
+    return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
+
+# Polar axes with one spoke per label, scaled to max_value (100 for percentiles)
+def spider_axes(labels, max_value, percentiles=False):
+    # Split the circle into even parts and save the angles
+    # so we know where to put each axis.
+    angles = np.linspace(0, 2 * np.pi, len(labels), endpoint=False).tolist()
+
+    # Build the figure outside pyplot so it isn't kept in pyplot's figure registry
+    fig = Figure(figsize=(6, 6))
+    ax = fig.add_subplot(polar=True)
+
+    ax.set_theta_offset(math.pi / 2)
+    ax.set_theta_direction(-1) 
+   
+    ax.set_xticks(angles)
+    ax.set_xticklabels(labels, color='black', size=12)
+    ax.tick_params(axis='x', pad=5.5)
+    
+    ax.set_rlabel_position(0)
+
+    tick_values = [max_value * i / 5 for i in range(1,6)]
+    ax.set_yticks(tick_values)
+    tick_labels = [f"{v:.0f}th" for v in tick_values] if percentiles else [f"{v:.2f}" for v in tick_values]
+    ax.set_yticklabels(tick_labels, color="black", size=8)
+    ax.set_ylim(0,max_value)
+
+    # The plot is a circle, so we need to "complete the loop"
+    # and append the start value to the end.
+    return fig, ax, angles + angles[:1]
+
+# With percentiles=True the values are league percentiles (0-100, higher is better) and the axes are scaled to match
+def make_spider(values, labels, color, title, max_value=None, division_avg=None, league_avg=None, percentiles=False):
+    if percentiles:
+        max_value = 100
+    elif max_value is None:
+        max_value = max(values + (division_avg or []) + (league_avg or []))
+    fig, ax, angles = spider_axes(labels, max_value, percentiles)
+    values = values + values[:1]
+ 
+
+    # Draw the outline of our data.
+    ax.plot(angles, values, color=color, linewidth=1, label="Team")
+    # Fill it in.
+    ax.fill(angles, values, color=color, alpha=0.25)
+
+    # Add division average if provided
+    if division_avg:
+        division_avg = division_avg + division_avg[:1]
+        ax.plot(angles, division_avg, color='blue', linewidth=2, linestyle='--', label='Division Avg')
+
+    # Add league average if provided
+    if league_avg:
+        league_avg = league_avg + league_avg[:1]
+        ax.plot(angles, league_avg, color='red', linewidth=2, linestyle=':', label='League Avg')
+
+
+    ax.set_title(title)
+    ax.legend(loc='upper right', bbox_to_anchor=(1.3, 1.1))
+
+    return(fig)
+
+# Several teams overlaid on one spider chart, series is {team: values}. Colors come from a fixed
+# palette so adding a team doesn't need its logo colors.
+def make_comparison_spider(series, labels, title, league_avg=None, percentiles=False):
+    max_value = 100 if percentiles else max(value for values in list(series.values()) + [league_avg or []] for value in values)
+    fig, ax, angles = spider_axes(labels, max_value, percentiles)
+    palette = sns.color_palette("tab20", len(series)) if len(series) > 10 else sns.color_palette("tab10")
+    for (team, values), color in zip(series.items(), palette):
+        values = values + values[:1]
+        ax.plot(angles, values, color=color, linewidth=1.5, label=team)
+        ax.fill(angles, values, color=color, alpha=0.1)
+    if league_avg:
+        league_avg = league_avg + league_avg[:1]
+        ax.plot(angles, league_avg, color='red', linewidth=2, linestyle=':', label='League Avg')
+    ax.set_title(title)
+    ax.legend(loc='upper left', bbox_to_anchor=(1.1, 1.1), ncol=2 if len(series) > 12 else 1, fontsize=8)
+    return fig
+
+# Cumulative wins/losses and attendance for the games played so far
+def make_record_chart(schedule_df, colors):
+    # Create a figure with 2 subplots arranged in a column
+    fig = Figure()
+    ax1, ax2 = fig.subplots(2, 1, sharex=True)
+    # Plot Cumulative Wins and Losses on the first axis (ax1)
+    sns.lineplot(x='Date', y='Cumulative_Wins', data=schedule_df, ax=ax1, label="Cumulative Wins", color=colors[0])
+    sns.lineplot(x='Date', y='Cumulative_Losses', data=schedule_df, ax=ax1, label="Cumulative Losses", color=colors[1])
+    # Remove unnecessary chart elements for a minimalist look
+    ax1.spines['top'].set_visible(False)
+    ax1.spines['right'].set_visible(False)
+    ax1.grid(False)  # Remove grid lines
+    ax1.set_ylabel("Wins/Losses")
+    ax1.set_title("Cumulative Wins & Losses Over Time")
+    ax1.legend(loc="upper left")
+    # Plot Attendance on the second axis (ax2)
+    sns.lineplot(x='Date', y='Attendance', data=schedule_df, ax=ax2, label="Attendance", color=colors[0])
+    # Minimalist style for the second graph
+    ax2.spines['top'].set_visible(False)
+    ax2.spines['right'].set_visible(False)
+    ax2.grid(False)  # Remove grid lines
+    ax2.set_ylabel("Attendance")    
+    ax2.set_title("Attendance Over Time")
+    # Adjust layout
+    fig.tight_layout()
+    return fig
+
+# Stacked wins/losses bars for home and away games
+def make_home_away_chart(HomeAway_df, colors):
+    fig = Figure(figsize=(8, 6))
+    ax = fig.add_subplot()
+    # Plot the stacked bars
+    ax.bar(HomeAway_df['Location'], HomeAway_df['Wins'], label='Wins', color=colors[0])
+    ax.bar(HomeAway_df['Location'], HomeAway_df['Losses'], bottom=HomeAway_df['Wins'], label='Losses', color=colors[1])
+    # Customize the plot
+    ax.set_ylabel('Games')
+    ax.set_title('Home vs Away Performance')
+    ax.legend()
+    # Add value labels on the bars
+    for i, location in enumerate(HomeAway_df['Location']):
+        wins = HomeAway_df.loc[i, 'Wins']
+        losses = HomeAway_df.loc[i, 'Losses']
+        ax.text(i, wins/2, str(wins), ha='center', va='center')
+        ax.text(i, wins + losses/2, str(losses), ha='center', va='center')
+    return fig
+
+# Rendered chart PNGs keyed on their input data and palette, with LRU eviction, plus the
+# worker pool the renders run on
+@st.cache_resource
+def get_render_cache():
+    return {"lock": threading.Lock(), "charts": OrderedDict(), "pool": ThreadPoolExecutor(max_workers=RENDER_WORKERS)}
+
+def chart_key(name, *args, **kwargs):
+    digest = hashlib.sha1(name.encode())
+    for arg in list(args) + sorted(kwargs.items()):
+        if isinstance(arg, pd.DataFrame):
+            digest.update(repr(list(arg.columns)).encode())
+            digest.update(pd.util.hash_pandas_object(arg).values.tobytes())
+        else:
+            digest.update(repr(arg).encode())
+    return digest.hexdigest()
+
+# Same savefig settings st.pyplot uses, and the figure is always released afterwards
+def figure_to_png(build, *args, **kwargs):
+    with timed("mlb_render_seconds", chart=build.__name__):
+        fig = build(*args, **kwargs)
+        try:
+            buffer = io.BytesIO()
+            fig.savefig(buffer, format="png", dpi=200, bbox_inches="tight")
+            return buffer.getvalue()
+        finally:
+            plt.close(fig)
+
+# Start rendering a chart on the worker pool and return a future with its PNG bytes.
+# Repeat views with the same inputs come straight from the cache and skip matplotlib.
+def submit_chart(name, build, *args, **kwargs):
+    cache = get_render_cache()
+    key = chart_key(name, *args, **kwargs)
+    with cache["lock"]:
+        if key in cache["charts"]:
+            count("mlb_render_cache_requests", chart=name, result="hit")
+            cache["charts"].move_to_end(key)
+            return cache["charts"][key]
+        count("mlb_render_cache_requests", chart=name, result="miss")
+        future = cache["pool"].submit(figure_to_png, build, *args, **kwargs)
+        cache["charts"][key] = future
+        while len(cache["charts"]) > RENDER_CACHE_SIZE:
+            cache["charts"].popitem(last=False)
+
+    # Failed renders aren't kept, so the next view tries again
+    def drop_failed(done):
+        if done.exception() is not None:
+            with cache["lock"]:
+                if cache["charts"].get(key) is done:
+                    del cache["charts"][key]
+    future.add_done_callback(drop_failed)
+    return future
@@ -0,0 +1,100 @@
+import datetime
+import argparse
+import sys
+
+from mlb_dashboard.config import IMPORT_BUDGET_MS, METRICS_FILE, PREFETCH_INTERVAL, SIM_BUDGET, SIMULATIONS, TEAM_STATS_STORE, TRENDS_STORE
+from mlb_dashboard.schedules import benchmark_convert_dates
+from mlb_dashboard.assets import build_team_assets, invalidate_team_assets
+from mlb_dashboard.team_stats import ingest_team_seasons
+from mlb_dashboard.players import memory_report
+from mlb_dashboard.prefetch import run_prefetch_loop, warm_current_season
+from mlb_dashboard.metrics import write_metrics
+from mlb_dashboard.import_budget import check_import_budget
+from mlb_dashboard.sources import get_data_source
+from mlb_dashboard.projections import get_season_projection
+from mlb_dashboard.trends import build_trend_rollups
+
+# Command line entry points, e.g. "python mlb-dashboard_2c.py assets build"
+def run_command(argv):
+    parser = argparse.ArgumentParser(prog="mlb-dashboard_2c.py")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    assets_parser = commands.add_parser("assets", help="Build or invalidate the local team asset bundle")
+    assets_parser.add_argument("action", choices=["build", "invalidate"])
+    assets_parser.add_argument("teams", nargs="*", help="Team abbreviations, defaults to all teams")
+
+    ingest_parser = commands.add_parser("ingest", help="Fetch team stats for a range of finished seasons into the columnar store")
+    ingest_parser.add_argument("start", type=int, nargs="?", default=2001)
+    ingest_parser.add_argument("end", type=int, nargs="?", default=datetime.datetime.now().year - 1)
+    ingest_parser.add_argument("--workers", type=int, default=4)
+
+    bench_dates_parser = commands.add_parser("bench-dates", help="Benchmark convert_dates against the per-row version")
+    bench_dates_parser.add_argument("--seasons", type=int, default=5)
+
+    warmup_parser = commands.add_parser("warmup", help="Pre-warm the current-season caches for all teams")
+    warmup_parser.add_argument("--loop", action="store_true", help="Keep running and refresh on an interval and after games go Final")
+    warmup_parser.add_argument("--interval", type=int, default=PREFETCH_INTERVAL or 900)
+
+    memory_parser = commands.add_parser("memory-report", help="Show the in-memory size of a season's frames against the full frames kept before")
+    memory_parser.add_argument("year", type=int, nargs="?", default=datetime.datetime.now().year - 1)
+
+    budget_parser = commands.add_parser("import-budget", help="Measure import time with -X importtime and check it against the budget")
+    budget_parser.add_argument("--module", default="mlb_dashboard.app")
+    budget_parser.add_argument("--budget", type=float, default=IMPORT_BUDGET_MS, help="Budget in milliseconds")
+
+    trends_parser = commands.add_parser("trends", help="Build the per-season and per-month rollups of finished seasons for the trend view")
+    trends_parser.add_argument("action", choices=["build"])
+    trends_parser.add_argument("start", type=int, nargs="?", default=2001)
+    trends_parser.add_argument("end", type=int, nargs="?", default=datetime.datetime.now().year - 1)
+    trends_parser.add_argument("--workers", type=int, default=4)
+    trends_parser.add_argument("--rebuild", action="store_true", help="Rebuild seasons that are already in the store")
+
+    simulate_parser = commands.add_parser("simulate", help="Simulate the rest of a season and print the playoff odds")
+    simulate_parser.add_argument("year", type=int, nargs="?", default=datetime.datetime.now().year)
+    simulate_parser.add_argument("--simulations", type=int, default=SIMULATIONS)
+    simulate_parser.add_argument("--budget", type=float, default=SIM_BUDGET, help="Time budget in seconds")
+
+    commands.add_parser("snapshots", help="Show the recorded snapshots that MLB_DATA_SOURCE=replay serves")
+
+    args = parser.parse_args(argv)
+    if args.command == "trends":
+        built = build_trend_rollups(args.start, args.end, args.workers, args.rebuild)
+        print(f"Rolled up {len(built)} of {args.end - args.start + 1} seasons into {TRENDS_STORE}")
+    elif args.command == "simulate":
+        projection = get_season_projection(args.year, simulations=args.simulations, budget=args.budget)
+        print(projection["odds"].to_string())
+        print(f"{projection['simulations']:,} simulations of {projection['games']} remaining games in "
+              f"{projection['seconds']:.2f} s (budget {args.budget:.1f} s)")
+    elif args.command == "snapshots":
+        source = get_data_source()
+        summary = source.summary()
+        for kind, (files, size) in summary.items():
+            print(f"{kind:12} {files:6} snapshots {size / 1e6:8.2f} MB")
+        print(f"{sum(files for files, _ in summary.values())} snapshots in {source.snapshot_dir} (data source: {source.mode})")
+    elif args.command == "import-budget":
+        if not check_import_budget(args.module, args.budget):
+            sys.exit(1)
+    elif args.command == "memory-report":
+        print(memory_report(args.year).to_string())
+    elif args.command == "warmup":
+        if args.loop:
+            run_prefetch_loop(args.interval)
+        else:
+            results = warm_current_season()
+            print(f"Warmed {sum(error is None for _, _, error in results)} of {len(results)} datasets")
+    elif args.command == "bench-dates":
+        benchmark_convert_dates(args.seasons)
+    elif args.command == "ingest":
+        ingested = ingest_team_seasons(args.start, args.end, args.workers)
+        seasons = max(min(args.end, datetime.datetime.now().year - 1) - args.start + 1, 0)
+        print(f"Ingested {len(ingested)} of {seasons} finished seasons into {TEAM_STATS_STORE}")
+    elif args.command == "assets":
+        if args.action == "invalidate":
+            invalidate_team_assets(args.teams)
+            print(f"Invalidated assets for {', '.join(args.teams) or 'all teams'}")
+        else:
+            built = build_team_assets(args.teams)
+            print(f"Built assets for {sum(asset['error'] is None for asset in built)} of {len(built)} teams")
+
+    if METRICS_FILE:
+        write_metrics(METRICS_FILE)
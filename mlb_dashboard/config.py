@@ -0,0 +1,71 @@
+import pandas as pd
+from pathlib import Path
+import os
+
+# Cache settings. Finished seasons never expire, the current season is refetched once its entry is older than CACHE_TTL seconds.
+# A season counts as finished from SEASON_END (month, day), after the last regular season games. An entry for a past season
+# that was saved before then is partial and expires like the current season's.
+SEASON_END = (10, 5)
+CACHE_DIR = Path(os.environ.get("MLB_CACHE_DIR", Path(__file__).resolve().parent.parent / ".mlb_cache"))
+CACHE_TTL = int(os.environ.get("MLB_CACHE_TTL", 3600))
+TEAM_ASSETS_PATH = CACHE_DIR / "team_assets.json"
+TEAM_LOGO_URL = os.environ.get("MLB_TEAM_LOGO_URL", "https://www.mlbstatic.com/team-logos/team-cap-on-light/{}.svg")
+DEFAULT_COLORS = ['#777777','#000000','#FFFFFF']
+TEAM_STATS_STORE = CACHE_DIR / "team_stats"
+TRENDS_STORE = CACHE_DIR / "trends"
+RENDER_CACHE_SIZE = int(os.environ.get("MLB_RENDER_CACHE_SIZE", 256))
+RENDER_WORKERS = int(os.environ.get("MLB_RENDER_WORKERS", 2))
+LEADERBOARD_SIZE = int(os.environ.get("MLB_LEADERBOARD_SIZE", 10))
+
+# Background prefetch settings. MLB_PREFETCH_INTERVAL=0 turns the in-app scheduler off.
+PREFETCH_INTERVAL = int(os.environ.get("MLB_PREFETCH_INTERVAL", 900))
+FINAL_POLL_INTERVAL = int(os.environ.get("MLB_FINAL_POLL_INTERVAL", 120))
+PREFETCH_WORKERS = int(os.environ.get("MLB_PREFETCH_WORKERS", 2))
+
+# The incremental standings sync asks statsapi for new results at most this often
+STANDINGS_SYNC_INTERVAL = int(os.environ.get("MLB_STANDINGS_SYNC_INTERVAL", 60))
+SEASON_GAMES = 162
+
+# Baseball-Reference blocks clients that make more than 20 requests a minute
+BREF_REQUEST_SPACING = 3.5
+
+# Settings for the shared HTTP client and the concurrent statsapi fetchers. MLB_STATSAPI_BASE can point at a local stub server.
+HTTP_TIMEOUT = (float(os.environ.get("MLB_CONNECT_TIMEOUT", 3.05)), float(os.environ.get("MLB_READ_TIMEOUT", 10)))
+STATSAPI_BASE = os.environ.get("MLB_STATSAPI_BASE", "https://statsapi.mlb.com/api/v1").rstrip("/")
+FETCH_WORKERS = int(os.environ.get("MLB_FETCH_WORKERS", 16))
+HOST_CONCURRENCY = int(os.environ.get("MLB_HOST_CONCURRENCY", 8))
+FETCH_RETRIES = 3
+FETCH_BACKOFF = 0.5
+
+# Rest-of-season simulation: MLB_SIMULATIONS seasons, MLB_SIM_BATCH at a time per array operation, on MLB_SIM_WORKERS
+# processes. It stops early after MLB_SIM_BUDGET seconds, 100k seasons of a full schedule fit in the default on one core.
+SIMULATIONS = int(os.environ.get("MLB_SIMULATIONS", 100_000))
+SIM_BATCH = int(os.environ.get("MLB_SIM_BATCH", 1000))
+SIM_BUDGET = float(os.environ.get("MLB_SIM_BUDGET", 3.0))
+SIM_WORKERS = int(os.environ.get("MLB_SIM_WORKERS", os.cpu_count() or 1))
+
+# Live game mode. The poller asks statsapi for today's games every MLB_LIVE_POLL_INTERVAL seconds while a
+# session has watched a team in the last LIVE_WATCH_TTL seconds, the live panel rereads its snapshot every MLB_LIVE_REFRESH.
+LIVE_POLL_INTERVAL = int(os.environ.get("MLB_LIVE_POLL_INTERVAL", 10))
+LIVE_REFRESH = int(os.environ.get("MLB_LIVE_REFRESH", 5))
+LIVE_WATCH_TTL = 60
+
+# Instrumentation. MLB_METRICS_PORT serves OpenMetrics text at http://localhost:<port>/metrics, MLB_METRICS_FILE
+# writes it to a file after each page run or command, and MLB_DEBUG=1 (or ?debug=1 in the URL) shows the debug sidebar.
+METRICS_PORT = int(os.environ.get("MLB_METRICS_PORT", 0))
+METRICS_FILE = os.environ.get("MLB_METRICS_FILE")
+METRICS_SAMPLES = 500
+DEBUG_SIDEBAR = os.environ.get("MLB_DEBUG", "") not in ("", "0")
+
+# Data source: "live", "record" (live, and every response is also saved under MLB_SNAPSHOT_DIR) or
+# "replay" (serve the saved responses only, no network)
+DATA_SOURCE = os.environ.get("MLB_DATA_SOURCE", "live")
+SNAPSHOT_DIR = Path(os.environ.get("MLB_SNAPSHOT_DIR", Path(__file__).resolve().parent.parent / ".mlb_snapshots"))
+
+# Import-time budget for the app modules, checked with "python mlb-dashboard_2c.py import-budget"
+IMPORT_BUDGET_MS = float(os.environ.get("MLB_IMPORT_BUDGET_MS", 1500))
+
+# Cached frames are shared between sessions, copy-on-write keeps a caller's changes to a frame
+# (or anything derived from it) from reaching the shared snapshot. It's always on from pandas 3.
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
@@ -0,0 +1,37 @@
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+from mlb_dashboard.config import IMPORT_BUDGET_MS
+
+# Libraries only some panels or commands need, importing the app must not pull them in. (Streamlit
+# itself loads the base plotly package, plotly.express is the expensive part.)
+LAZY_MODULES = ["pybaseball", "matplotlib", "seaborn", "plotly.express", "pygal", "statsapi", "streamlit_extras"]
+
+# Import a module in a fresh interpreter under "-X importtime" and return the cumulative time of
+# every module it loaded, in microseconds, keyed by name with the nesting depth alongside
+def measure_imports(module):
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=Path(__file__).resolve().parent.parent, capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        # "import time:       412 |       1305 |   pandas.core"
+        match = re.match(r"import time:\s+\d+ \|\s+(\d+) \|( +)(\S+)", line)
+        if match:
+            times[match.group(3)] = (int(match.group(1)), len(match.group(2)) - 1)
+    return times
+
+# Print the slowest packages and fail when the total is over budget or a lazy library was loaded
+def check_import_budget(module="mlb_dashboard.app", budget_ms=IMPORT_BUDGET_MS, top=10):
+    times = measure_imports(module)
+    total_ms = sum(us for us, depth in times.values() if depth == 0) / 1000
+    packages = sorted(((us, name) for name, (us, depth) in times.items() if "." not in name and depth > 0), reverse=True)
+    for us, name in packages[:top]:
+        print(f"{name:40} {us / 1000:8.1f} ms")
+    print(f"{'total':40} {total_ms:8.1f} ms (budget {budget_ms:.0f} ms)")
+
+    eager = sorted(lazy for lazy in LAZY_MODULES if any(name == lazy or name.startswith(lazy + ".") for name in times))
+    if eager:
+        print(f"Imported eagerly, should be lazy: {', '.join(eager)}")
+    return total_ms <= budget_ms and not eager
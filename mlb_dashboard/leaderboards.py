@@ -0,0 +1,109 @@
+import pandas as pd
+
+from mlb_dashboard.config import LEADERBOARD_SIZE
+from mlb_dashboard.cache import derived_snapshot
+from mlb_dashboard.players import get_player_data
+from mlb_dashboard.team_stats import innings_from_ip
+from mlb_dashboard.teams import get_team_abbreviation, mlb_teams, team_divisions
+
+# Leaderboard stats: the frame they come from, whether lower is better, and whether only qualified
+# players (3.1 plate appearances or 1 inning pitched per team game) are ranked. wRC+ is ranked
+# when the source has it.
+leaderboard_metrics = {
+    'OPS': ('batting', False, True),
+    'HR': ('batting', False, False),
+    'wRC+': ('batting', False, True),
+    'ERA': ('pitching', True, True),
+    'FIP': ('pitching', True, True),
+    'WHIP': ('pitching', True, True),
+}
+
+# Baseball-Reference lists a player's club by city and league ("Chicago", "Maj-NL")
+def team_city(name):
+    for nickname in ("Red Sox", "White Sox", "Blue Jays"):
+        if name.endswith(nickname):
+            return name[:-len(nickname) - 1]
+    return name.rsplit(" ", 1)[0]
+
+bref_player_teams = {(team_city(name), team_divisions[abbr][:2]): abbr for abbr, name in mlb_teams.items()}
+
+# Abbreviation for a player's club. Players who changed teams are listed under their last club.
+def player_team_abbreviation(tm, lev=None):
+    tm = str(tm).split(",")[-1].strip()
+    if tm in mlb_teams:
+        return tm
+    league = str(lev)[-2:] if lev is not None else None
+    return get_team_abbreviation(tm) or bref_player_teams.get((tm, league))
+
+# Numeric copies of the player frames with a Team abbreviation, qualification flags, and the
+# leaderboard stats the source doesn't provide (OPS, WHIP, FIP)
+def leaderboard_frames(batting, pitching):
+    batting = batting.copy()
+    pitching = pitching.copy()
+    for df in (batting, pitching):
+        levels = df['Lev'] if 'Lev' in df.columns else [None] * len(df)
+        df['Team'] = [player_team_abbreviation(tm, lev) for tm, lev in zip(df['Tm'], levels)]
+        for col in df.columns.difference(['Name', 'Tm', 'Lev', 'Team']):
+            if df[col].dtype == 'float32':
+                # The compact frames hold rate stats as float32, where 0.9 is 0.89999998
+                df[col] = df[col].astype(float).round(6)
+            elif col != 'IP':
+                converted = pd.to_numeric(df[col], errors='coerce')
+                if converted.notna().any():
+                    df[col] = converted
+
+    if 'OPS' not in batting.columns and {'OBP', 'SLG'} <= set(batting.columns):
+        batting['OPS'] = batting['OBP'] + batting['SLG']
+    # Players who appeared in every game give the number of team games so far. Without plate
+    # appearances or innings in the source, every player counts as qualified.
+    team_games = batting['G'].max() if 'G' in batting.columns else 0
+    batting['Qualified'] = batting['PA'] >= 3.1 * team_games if 'PA' in batting.columns else True
+    if 'IP' not in pitching.columns:
+        pitching['Qualified'] = True
+        return batting, pitching
+
+    innings = innings_from_ip(pitching['IP'])
+    pitching['Qualified'] = innings >= team_games
+    if 'WHIP' not in pitching.columns and {'BB', 'H'} <= set(pitching.columns):
+        pitching['WHIP'] = (pitching['BB'] + pitching['H']) / innings
+    if {'HR', 'BB', 'SO', 'ERA'} <= set(pitching.columns):
+        hbp = pitching['HBP'].fillna(0) if 'HBP' in pitching.columns else 0
+        fip_core = 13 * pitching['HR'] + 3 * (pitching['BB'] + hbp) - 2 * pitching['SO']
+        # The FIP constant puts league FIP on the league ERA scale
+        league_era = (pitching['ERA'] * innings).sum() / innings.sum()
+        constant = league_era - fip_core.sum() / innings.sum()
+        pitching['FIP'] = (fip_core / innings.where(innings > 0) + constant).round(2)
+    return batting, pitching
+
+# Rank every leaderboard stat once: the top LEADERBOARD_SIZE players league-wide and per club
+def build_leaderboards(batting, pitching, size=LEADERBOARD_SIZE):
+    frames = dict(zip(('batting', 'pitching'), leaderboard_frames(batting, pitching)))
+    leaderboards = {}
+    for metric, (source, ascending, qualified) in leaderboard_metrics.items():
+        df = frames[source]
+        if metric not in df.columns:
+            continue
+        if qualified:
+            df = df[df['Qualified']]
+        context = 'PA' if source == 'batting' else 'IP'
+        ranked = df.dropna(subset=[metric]).sort_values(metric, ascending=ascending, kind='stable')
+        ranked = ranked[[col for col in ('Name', 'Team', context, metric) if col in ranked.columns]]
+        leaderboards[metric] = {
+            'league': ranked.head(size).reset_index(drop=True),
+            'teams': {team: top.reset_index(drop=True) for team, top in ranked.groupby('Team').head(size).groupby('Team')},
+        }
+    return leaderboards
+
+# A season's leaderboards, built once per player data snapshot and shared by every session
+def get_leaderboards(year):
+    player_data = get_player_data(year)
+    return derived_snapshot(f"player_leaderboards_{year}", player_data, lambda: build_leaderboards(*player_data))
+
+# Top players for a stat, league-wide or for one club. None if the source has no such stat.
+def get_leaderboard(year, metric, team=None):
+    leaderboard = get_leaderboards(year).get(metric)
+    if leaderboard is None:
+        return None
+    if team is None:
+        return leaderboard['league']
+    return leaderboard['teams'].get(team, leaderboard['league'].iloc[0:0])
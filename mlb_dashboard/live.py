@@ -0,0 +1,172 @@
+import streamlit as st
+import datetime
+import time
+import threading
+
+from mlb_dashboard.config import LIVE_POLL_INTERVAL, LIVE_REFRESH, LIVE_WATCH_TTL
+from mlb_dashboard.cache import single_flight
+from mlb_dashboard.metrics import count, timed
+from mlb_dashboard.teams import statsapi_team_abbreviation
+from mlb_dashboard.upstream import statsapi_get_json
+
+# Latest snapshot of every watched team's game, shared by every session. Sessions register the
+# teams they show in watchers, and the poller only asks statsapi about those.
+@st.cache_resource
+def get_live_state():
+    return {"lock": threading.Lock(), "watchers": {}, "games": {}}
+
+# The values of one game from a statsapi schedule entry hydrated with its linescore. A final
+# game's win probability is settled, a game that hasn't started has none.
+def game_snapshot(game):
+    linescore = game.get('linescore', {})
+    runs = {side: linescore.get('teams', {}).get(side, {}).get('runs', game['teams'][side].get('score', 0)) for side in ('away', 'home')}
+    state = game['status']['abstractGameState']
+    snapshot = {
+        'game_pk': game['gamePk'],
+        'state': state,
+        'status': game['status']['detailedState'],
+        'away': statsapi_team_abbreviation(game['teams']['away']['team']),
+        'home': statsapi_team_abbreviation(game['teams']['home']['team']),
+        'away_runs': runs['away'],
+        'home_runs': runs['home'],
+        'inning': f"{linescore['inningHalf']} {linescore['currentInningOrdinal']}" if 'inningHalf' in linescore else None,
+        'outs': linescore.get('outs'),
+        'home_win_probability': None,
+    }
+    if state == 'Final':
+        snapshot['home_win_probability'] = 100.0 if runs['home'] > runs['away'] else 0.0
+    return snapshot
+
+# The game a team's live panel follows today: the one in progress, else the last one that
+# finished, else the next one scheduled
+def team_game(games, team_id):
+    games = [game for game in games if team_id in (game['teams']['home']['team']['id'], game['teams']['away']['team']['id'])]
+    for state, pick in (('Live', 0), ('Final', -1), ('Preview', 0)):
+        matching = [game for game in games if game['status']['abstractGameState'] == state]
+        if matching:
+            return matching[pick]
+    return None
+
+# Fields whose values differ between two snapshots, as {field: (old, new)}. A different game
+# counts as every field changing.
+def diff_snapshots(old, new):
+    if new is None:
+        return {} if old is None else {'game_pk': (old['game_pk'], None)}
+    if old is None or old['game_pk'] != new['game_pk']:
+        return {field: (None, value) for field, value in new.items()}
+    return {field: (old[field], value) for field, value in new.items() if old[field] != value}
+
+# Home team win probability after the latest play, in percent
+def get_win_probability(game_pk):
+    plays = statsapi_get_json(f'game/{game_pk}/winProbability')
+    return round(plays[-1]['homeTeamWinProbability'], 1) if plays else None
+
+# Poll today's games once: a single schedule request covers every watched team, and win
+# probability is only fetched for live games whose linescore changed. A snapshot that changed
+# gets a new version, so sessions can tell without comparing values.
+def poll_live_games(date=None):
+    state = get_live_state()
+    now = time.time()
+    with state["lock"]:
+        watched = [team_id for team_id, seen in state["watchers"].items() if now - seen < LIVE_WATCH_TTL]
+    if not watched:
+        return 0
+
+    date = date or datetime.date.today()
+    with timed("mlb_fetch_seconds", fetcher="live_games"):
+        data = statsapi_get_json('schedule', {'sportId': 1, 'date': date.isoformat(), 'hydrate': 'linescore'})
+    games = [game for day in data.get('dates', []) for game in day['games']]
+
+    changed = 0
+    for team_id in watched:
+        game = team_game(games, team_id)
+        snapshot = game_snapshot(game) if game is not None else None
+        entry = state["games"].get(team_id)
+        old = entry["snapshot"] if entry is not None else None
+        if snapshot is not None and snapshot['home_win_probability'] is None and old is not None and old['game_pk'] == snapshot['game_pk']:
+            snapshot['home_win_probability'] = old['home_win_probability']
+        changes = diff_snapshots(old, snapshot)
+        if snapshot is not None and snapshot['state'] == 'Live' and (changes or snapshot['home_win_probability'] is None):
+            snapshot['home_win_probability'] = get_win_probability(snapshot['game_pk'])
+            changes = diff_snapshots(old, snapshot)
+
+        count("mlb_live_polls", result="changed" if changes or entry is None else "unchanged")
+        with state["lock"]:
+            if entry is None or changes:
+                version = entry["version"] + 1 if entry is not None else 1
+                state["games"][team_id] = {"snapshot": snapshot, "version": version, "polled_at": now}
+                changed += 1
+            else:
+                entry["polled_at"] = now
+    return changed
+
+# Poll every interval seconds for as long as the process runs. Nothing is requested while no
+# session is watching a team.
+def run_live_poller(interval=LIVE_POLL_INTERVAL):
+    while True:
+        try:
+            single_flight("live_games", poll_live_games)
+        except Exception as e:
+            print(f"Live poller error: {e}")
+            count("mlb_live_polls", result="error")
+        time.sleep(interval)
+
+# Start the live poller once per process, the first time a session turns live mode on
+@st.cache_resource
+def start_live_poller(interval=LIVE_POLL_INTERVAL):
+    thread = threading.Thread(target=run_live_poller, args=(interval,), name="mlb-live", daemon=True)
+    thread.start()
+    return thread
+
+# Register a session's interest in a team and return the latest entry for its game. The first
+# session to watch a team polls once itself, after that the poller keeps the entry current.
+def watch_team(team_id):
+    state = get_live_state()
+    with state["lock"]:
+        state["watchers"][team_id] = time.time()
+    if team_id not in state["games"]:
+        try:
+            single_flight("live_games", poll_live_games)
+        except Exception as e:
+            print(f"Error polling live games: {e}")
+            count("mlb_live_polls", result="error")
+    return state["games"].get(team_id)
+
+# Live score panel for a team's game today. Only this fragment reruns on the timer, it reads the
+# poller's shared snapshot and never fetches or redraws the rest of the page. Deltas show what
+# changed since this session last saw a new version.
+@st.fragment(run_every=LIVE_REFRESH)
+def show_live_game(team_id):
+    with timed("mlb_panel_seconds", panel="live"):
+        entry = watch_team(team_id)
+        if entry is None:
+            st.caption("Waiting for the live game feed.")
+            return
+        snapshot = entry["snapshot"]
+        if snapshot is None:
+            st.caption("No game today.")
+            return
+
+        seen = st.session_state.get(f"live_game_{team_id}")
+        if seen is None or seen["version"] != entry["version"]:
+            changes = diff_snapshots(seen["snapshot"], snapshot) if seen is not None else {}
+            seen = {"version": entry["version"], "snapshot": snapshot, "changes": changes}
+            st.session_state[f"live_game_{team_id}"] = seen
+        changes = seen["changes"]
+
+        def delta(field):
+            old, new = changes.get(field, (None, None))
+            if old is None or new is None:
+                return None
+            return new - old
+
+        probability = snapshot['home_win_probability']
+        probability_delta = delta('home_win_probability')
+        col1, col2, col3, col4, col5 = st.columns(5)
+        col1.metric(snapshot['away'], snapshot['away_runs'], delta=delta('away_runs'))
+        col2.metric(snapshot['home'], snapshot['home_runs'], delta=delta('home_runs'))
+        col3.metric("Inning", snapshot['inning'] or snapshot['status'], delta=None)
+        col4.metric("Outs", snapshot['outs'] if snapshot['state'] == 'Live' else "-", delta=None)
+        col5.metric(f"{snapshot['home']} Win %", f"{probability:.1f}%" if probability is not None else "-",
+                    delta=f"{probability_delta:+.1f}" if probability_delta else None)
+        st.caption(f"{snapshot['status']}, updated {datetime.datetime.fromtimestamp(entry['polled_at']):%H:%M:%S}")
@@ -0,0 +1,122 @@
+import streamlit as st
+import pandas as pd
+import numpy as np
+from pathlib import Path
+import os
+import time
+from collections import deque
+import threading
+import contextlib
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from mlb_dashboard.config import METRICS_PORT, METRICS_SAMPLES
+
+# Process-wide metrics: counters, and timing spans that keep a count, a sum and the latest samples.
+# Both are keyed by (name, labels).
+@st.cache_resource
+def get_metrics():
+    return {"lock": threading.Lock(), "counters": {}, "timings": {}}
+
+def metric_key(name, labels):
+    return name, tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+# Add to a counter, e.g. count("mlb_fallbacks", dataset="standings")
+def count(name, value=1, **labels):
+    metrics = get_metrics()
+    key = metric_key(name, labels)
+    with metrics["lock"]:
+        metrics["counters"][key] = metrics["counters"].get(key, 0) + value
+
+def record_timing(name, seconds, **labels):
+    metrics = get_metrics()
+    key = metric_key(name, labels)
+    with metrics["lock"]:
+        timing = metrics["timings"].get(key)
+        if timing is None:
+            timing = metrics["timings"][key] = {"count": 0, "sum": 0.0, "samples": deque(maxlen=METRICS_SAMPLES)}
+        timing["count"] += 1
+        timing["sum"] += seconds
+        timing["samples"].append(seconds)
+
+# Time a block, e.g. "with timed("mlb_panel_seconds", panel="kpis"):". Failed blocks are timed too.
+@contextlib.contextmanager
+def timed(name, **labels):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_timing(name, time.perf_counter() - start, **labels)
+
+# Counters and timing summaries as DataFrames, for the debug sidebar
+def metrics_frames():
+    metrics = get_metrics()
+    with metrics["lock"]:
+        counters = list(metrics["counters"].items())
+        timings = [(key, timing["count"], timing["sum"], list(timing["samples"])) for key, timing in metrics["timings"].items()]
+    labels = lambda key: ", ".join(f"{k}={v}" for k, v in key[1])
+    counter_df = pd.DataFrame([(key[0], labels(key), value) for key, value in sorted(counters)],
+                              columns=['Metric', 'Labels', 'Value'])
+    timing_df = pd.DataFrame([(key[0], labels(key), n, total, samples[-1], np.percentile(samples, 50), np.percentile(samples, 95))
+                              for key, n, total, samples in sorted(timings, key=lambda timing: timing[0])],
+                             columns=['Span', 'Labels', 'Count', 'Total s', 'Last s', 'p50 s', 'p95 s'])
+    return counter_df, timing_df
+
+def openmetrics_labels(labels, **extra):
+    pairs = list(labels) + list(extra.items())
+    if not pairs:
+        return ""
+    escape = lambda value: str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return "{" + ",".join(f'{key}="{escape(value)}"' for key, value in pairs) + "}"
+
+# All metrics in the OpenMetrics text format: counters as <name>_total, spans as summaries in seconds
+def metrics_text():
+    metrics = get_metrics()
+    with metrics["lock"]:
+        counters = dict(metrics["counters"])
+        timings = {key: (timing["count"], timing["sum"], list(timing["samples"])) for key, timing in metrics["timings"].items()}
+    lines = []
+    for family in sorted({name for name, _ in counters}):
+        lines.append(f"# TYPE {family} counter")
+        for (name, labels), value in sorted(counters.items()):
+            if name == family:
+                lines.append(f"{name}_total{openmetrics_labels(labels)} {value}")
+    for family in sorted({name for name, _ in timings}):
+        lines.append(f"# TYPE {family} summary")
+        lines.append(f"# UNIT {family} seconds")
+        for (name, labels), (n, total, samples) in sorted(timings.items()):
+            if name != family:
+                continue
+            for quantile in (0.5, 0.95, 0.99):
+                lines.append(f"{name}{openmetrics_labels(labels, quantile=quantile)} {np.percentile(samples, quantile * 100):.6f}")
+            lines.append(f"{name}_sum{openmetrics_labels(labels)} {total:.6f}")
+            lines.append(f"{name}_count{openmetrics_labels(labels)} {n}")
+    lines.append("# EOF")
+    return "\n".join(lines) + "\n"
+
+def write_metrics(path):
+    path = Path(path)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    tmp_path.write_text(metrics_text())
+    os.replace(tmp_path, path)
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = metrics_text().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/openmetrics-text; version=1.0.0; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+# Serve /metrics on localhost once per process
+@st.cache_resource
+def start_metrics_server(port=METRICS_PORT):
+    server = ThreadingHTTPServer(("127.0.0.1", port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="mlb-metrics", daemon=True).start()
+    return server
@@ -0,0 +1,87 @@
+import pandas as pd
+
+from mlb_dashboard.team_stats import compact_frame, get_team_data, get_team_data_full
+from mlb_dashboard.metrics import count
+from mlb_dashboard.cache import season_cache
+from mlb_dashboard.upstream import fetch_all, first_split_stat, statsapi_get_json
+from mlb_dashboard.teams import player_batting_columns, player_pitching_columns, statsapi_player_columns, statsapi_team_abbreviation
+from mlb_dashboard.sources import pybaseball
+
+# Function to get player data. Like get_team_data only the leaderboard columns are kept in
+# memory, pass columns to load others on demand from the full frames in the disk cache.
+def get_player_data(year, batting_columns=None, pitching_columns=None):
+    if batting_columns is None and pitching_columns is None:
+        return get_player_data_compact(year)
+    return project_player_data(get_player_data_full(year), batting_columns or player_batting_columns,
+                               pitching_columns or player_pitching_columns)
+
+def project_player_data(full, batting_columns, pitching_columns):
+    batting, pitching = full
+    return (compact_frame(batting[[col for col in batting_columns if col in batting.columns]]),
+            compact_frame(pitching[[col for col in pitching_columns if col in pitching.columns]]))
+
+@season_cache("player_data_compact")
+def get_player_data_compact(year):
+    return project_player_data(get_player_data_full(year), player_batting_columns, player_pitching_columns)
+
+# Refetch the full frames and rebuild the projection from them, e.g. for the prefetcher
+def refresh_player_data(year):
+    get_player_data_full.refresh(year)
+    return get_player_data_compact.refresh(year)
+
+get_player_data.refresh = refresh_player_data
+
+# Baseball-Reference batting and pitching frames with every column, cached on disk only
+@season_cache("player_data", memory=False)
+def get_player_data_full(year):
+    try:
+        batting = pybaseball.batting_stats_bref(year)
+        pitching = pybaseball.pitching_stats_bref(year)
+        return batting, pitching
+    except Exception as e:
+        print(f"Error fetching player data from pybaseball: {e}")
+        count("mlb_fallbacks", dataset="player_data", source="statsapi")
+        return get_player_data_statsapi(year)
+
+def get_player_data_statsapi(year):
+    batting = []
+    pitching = []
+    teams = statsapi_get_json('teams', {'sportId': 1, 'season': year})['teams']
+    rosters = fetch_all(lambda team: statsapi_get_json(f"teams/{team['id']}/roster")['roster'], teams)
+    players = [(team, player) for team, roster in zip(teams, rosters) for player in roster]
+
+    # One request per player returns both the hitting and the pitching season line
+    def fetch_player_stats(request):
+        team, player = request
+        player_id = player['person']['id']
+        return statsapi_get_json(f"people/{player_id}/stats", {'stats': 'season', 'group': 'hitting,pitching', 'season': year})
+
+    for (team, player), player_stats in zip(players, fetch_all(fetch_player_stats, players)):
+        for group, rows in (('hitting', batting), ('pitching', pitching)):
+            stats = first_split_stat(player_stats, group)
+            if stats:
+                stats['Name'] = player['person']['fullName']
+                stats['Team'] = statsapi_team_abbreviation(team)
+                rows.append(stats)
+    
+    # Use the Baseball-Reference column names so both paths share one schema
+    return pd.DataFrame(batting).rename(columns=statsapi_player_columns), pd.DataFrame(pitching).rename(columns=statsapi_player_columns)
+
+# In-memory size of the frames the dashboard keeps per season, against the full frames that
+# were kept before. The full frames now stay on disk, they're read here only to measure them.
+def memory_report(year):
+    batting_full, pitching_full = get_player_data_full(year)
+    batting, pitching = get_player_data(year)
+    rows = [
+        ("team data", get_team_data_full(year), get_team_data(year)),
+        ("player batting", batting_full, batting),
+        ("player pitching", pitching_full, pitching),
+    ]
+    report = pd.DataFrame(
+        [(name, full.shape[1], full.memory_usage(deep=True).sum(), compact.shape[1], compact.memory_usage(deep=True).sum())
+         for name, full, compact in rows],
+        columns=['Dataset', 'Columns before', 'Bytes before', 'Columns in memory', 'Bytes in memory'],
+    ).set_index('Dataset')
+    report.loc['Total'] = report.sum()
+    report['Saved %'] = (100 * (1 - report['Bytes in memory'] / report['Bytes before'])).round(1)
+    return report
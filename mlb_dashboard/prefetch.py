@@ -0,0 +1,93 @@
+import streamlit as st
+import datetime
+import time
+import threading
+
+from mlb_dashboard.config import BREF_REQUEST_SPACING, FINAL_POLL_INTERVAL, PREFETCH_INTERVAL, PREFETCH_WORKERS
+from mlb_dashboard.upstream import fetch_all, statsapi_get_json
+from mlb_dashboard.schedules import get_league_schedule, get_schedule
+from mlb_dashboard.standings import get_standings, sync_standings
+from mlb_dashboard.assets import get_team_assets
+from mlb_dashboard.team_stats import get_team_data
+from mlb_dashboard.players import get_player_data
+from mlb_dashboard.projections import get_season_projection
+from mlb_dashboard.teams import mlb_teams, statsapi_team_abbreviation
+
+# Warm (or with refresh=True, refetch) the current-season data main() needs. Teams limits the
+# per-team schedules to those clubs, by default all 30.
+def warm_current_season(refresh=False, teams=None):
+    year = datetime.datetime.now().year
+    teams = list(mlb_teams) if teams is None else teams
+
+    def run(task):
+        label, func, args = task
+        start = time.perf_counter()
+        try:
+            (func.refresh if refresh and hasattr(func, "refresh") else func)(*args)
+            return label, time.perf_counter() - start, None
+        except Exception as e:
+            return label, time.perf_counter() - start, e
+
+    # FanGraphs, statsapi and mlbstatic fetches go out in parallel
+    tasks = [("team data", get_team_data, (year,)), ("league schedule", get_league_schedule, (year,))]
+    tasks += [(f"assets {abbr}", get_team_assets, (abbr,)) for abbr in mlb_teams]
+    results = fetch_all(run, tasks, max_workers=PREFETCH_WORKERS)
+
+    # Baseball-Reference pages are fetched one at a time and spaced out to stay under its rate limit
+    bref_tasks = [("standings", get_standings, (year,)), ("player data", get_player_data, (year,))]
+    bref_tasks += [(f"schedule {abbr}", get_schedule, (year, abbr)) for abbr in teams]
+    for task in bref_tasks:
+        result = run(task)
+        results.append(result)
+        # Cache hits come back instantly and don't count against the limit
+        if result[1] > 0.5:
+            time.sleep(BREF_REQUEST_SPACING)
+
+    # Simulate the season from the same synced standings the page uses, so visitors get cached odds
+    results.append(run(("projection", lambda year: get_season_projection(year, sync_standings(year)), (year,))))
+
+    for label, elapsed, error in results:
+        if error is not None:
+            print(f"Prefetch of {label} failed: {error}")
+    return results
+
+# Ids of today's games that are Final, and the teams that played in them
+def get_final_games(date=None):
+    date = date or datetime.date.today()
+    data = statsapi_get_json('schedule', {'sportId': 1, 'date': date.isoformat()})
+    finals = {}
+    for day in data.get('dates', []):
+        for game in day['games']:
+            if game['status']['abstractGameState'] == 'Final':
+                finals[game['gamePk']] = [statsapi_team_abbreviation(game['teams'][side]['team']) for side in ('home', 'away')]
+    return finals
+
+# Warm everything on startup, refetch it all every interval seconds, and in between refetch the
+# teams whose games have just gone Final
+def run_prefetch_loop(interval=PREFETCH_INTERVAL, poll_interval=FINAL_POLL_INTERVAL):
+    warm_current_season()
+    last_full_refresh = time.time()
+    seen_finals = None
+    while True:
+        time.sleep(min(interval, poll_interval))
+        try:
+            if time.time() - last_full_refresh >= interval:
+                warm_current_season(refresh=True)
+                last_full_refresh = time.time()
+                continue
+            finals = get_final_games()
+            new_games = set(finals) - set(seen_finals or {})
+            if seen_finals is not None and new_games:
+                teams = sorted({abbr for game in new_games for abbr in finals[game] if abbr})
+                print(f"{len(new_games)} game(s) went Final, refreshing {', '.join(teams)}")
+                warm_current_season(refresh=True, teams=teams)
+            seen_finals = finals
+        except Exception as e:
+            print(f"Prefetch loop error: {e}")
+
+# Start the prefetch loop once per process, Streamlit keeps the thread across reruns and sessions
+@st.cache_resource
+def start_prefetch_scheduler(interval=PREFETCH_INTERVAL):
+    thread = threading.Thread(target=run_prefetch_loop, args=(interval,), name="mlb-prefetch", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,195 @@
+import streamlit as st
+import pandas as pd
+import numpy as np
+import multiprocessing
+import hashlib
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from mlb_dashboard.config import SIM_BATCH, SIM_BUDGET, SIM_WORKERS, SIMULATIONS
+from mlb_dashboard.cache import get_memory_cache, single_flight
+from mlb_dashboard.metrics import count, timed
+from mlb_dashboard.aggregates import get_team_aggregates
+from mlb_dashboard.standings import current_league_schedule, get_standings
+from mlb_dashboard.teams import division_names, team_abbreviation, team_divisions
+
+# Pythagorean exponent for baseball, and the share of games the home team wins
+PYTHAGOREAN_EXPONENT = 1.83
+HOME_WIN_PCT = 0.54
+# Early in the season run differential says little, a team's strength is regressed towards .500
+# as if it had played this many extra .500 games
+REGRESSION_GAMES = 70
+# Wild cards per league, on top of the three division winners
+WILD_CARDS = 3
+
+# Expected winning percentage from runs scored and allowed
+def pythagorean(runs, runs_against, exponent=PYTHAGOREAN_EXPONENT):
+    return runs ** exponent / (runs ** exponent + runs_against ** exponent)
+
+# Chance the home team wins a game between two teams of these strengths (log5), with home field
+def log5(p_home, p_away, home_win_pct=HOME_WIN_PCT):
+    odds = (p_home * (1 - p_away)) / (p_away * (1 - p_home)) * home_win_pct / (1 - home_win_pct)
+    return odds / (1 + odds)
+
+# Arrays the simulation runs on: current wins, and for every remaining game the home and away
+# team (as positions in team_divisions) and the home team's chance of winning
+def projection_inputs(year, standings):
+    teams = list(team_divisions)
+    position = {abbr: i for i, abbr in enumerate(teams)}
+    record = standings.set_axis([team_abbreviation(team) for team in standings['Tm']])
+    record = record[['W', 'L']].apply(pd.to_numeric, errors='coerce').reindex(teams).fillna(0).astype(int)
+
+    aggregates = get_team_aggregates(year)
+    runs = aggregates["values"].rename(index={label: abbr for abbr, label in aggregates["rows"].items()})
+    runs = runs[['R', 'RA']].reindex(teams) if {'R', 'RA'} <= set(runs.columns) else pd.DataFrame(index=teams, columns=['R', 'RA'], dtype=float)
+    played = (record['W'] + record['L']).to_numpy()
+    strength = np.nan_to_num(pythagorean(runs['R'].to_numpy(float), runs['RA'].to_numpy(float)), nan=0.5)
+    strength = 0.5 + (strength - 0.5) * played / (played + REGRESSION_GAMES)
+
+    # Every game is listed once per team, the home rows cover each game once
+    schedule = current_league_schedule(year)
+    remaining = schedule[schedule['W/L'].isna() & (schedule['Home_Away'] == 'Home')]
+    home = remaining.index.get_level_values('Team').map(position)
+    away = remaining['Opp'].map(position)
+    known = home.notna() & away.notna().to_numpy()
+    home = np.asarray(home[known], dtype=np.intp)
+    away = np.asarray(away[known], dtype=np.intp)
+
+    return {
+        "teams": teams,
+        "wins": record['W'].to_numpy(),
+        "losses": record['L'].to_numpy(),
+        "home": home,
+        "away": away,
+        "p_home": log5(strength[home], strength[away]),
+        "divisions": [np.array([position[abbr] for abbr in teams if team_divisions[abbr] == name]) for name in division_names],
+        "leagues": [np.array([position[abbr] for abbr in teams if team_divisions[abbr][:2] == league]) for league in ("AL", "NL")],
+    }
+
+# Simulate the rest of the season simulations times, batch seasons at a time as one array
+# operation: a (batch, games) draw of home wins times a (games, teams) matrix gives every team's
+# wins in every season. Ties are broken at random. Returns per-team totals of projected wins,
+# division titles and wild cards.
+def simulate_seasons(wins, home, away, p_home, divisions, leagues, simulations, seed, batch=SIM_BATCH):
+    rng = np.random.default_rng(seed)
+    teams = len(wins)
+    games = np.arange(len(home))
+    # A home win is +1 for the home team, a home loss +1 for the away team
+    swing = np.zeros((len(home), teams), dtype=np.float32)
+    np.add.at(swing, (games, home), 1)
+    np.add.at(swing, (games, away), -1)
+    base = (wins + np.bincount(away, minlength=teams)).astype(np.float32)
+    p_home = p_home.astype(np.float32)
+
+    totals = {"wins": np.zeros(teams), "division": np.zeros(teams), "wild_card": np.zeros(teams)}
+    for start in range(0, simulations, batch):
+        size = min(batch, simulations - start)
+        seasons = np.arange(size)
+        final_wins = base + (rng.random((size, len(home)), dtype=np.float32) < p_home).astype(np.float32) @ swing
+        score = final_wins + rng.random((size, teams), dtype=np.float32)
+
+        division = np.zeros((size, teams), dtype=bool)
+        for members in divisions:
+            division[seasons, members[score[:, members].argmax(axis=1)]] = True
+        wild_card = np.zeros((size, teams), dtype=bool)
+        contenders = np.where(division, -np.inf, score)
+        for members in leagues:
+            top = np.argpartition(-contenders[:, members], WILD_CARDS - 1, axis=1)[:, :WILD_CARDS]
+            wild_card[seasons[:, None], members[top]] = True
+
+        totals["wins"] += final_wins.sum(axis=0)
+        totals["division"] += division.sum(axis=0)
+        totals["wild_card"] += wild_card.sum(axis=0)
+    return simulations, totals
+
+# Worker processes for the simulation, started once per process. Spawned rather than forked, the
+# Streamlit server has threads running.
+@st.cache_resource
+def get_simulation_pool():
+    return ProcessPoolExecutor(max_workers=SIM_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+
+# Run simulations in chunks, on the worker pool when there's more than one worker, until they're
+# all done or the time budget runs out. At least one chunk always finishes, so a slow machine
+# gets fewer simulations rather than no odds.
+def run_simulations(inputs, simulations=SIMULATIONS, budget=SIM_BUDGET, workers=SIM_WORKERS):
+    args = [inputs[name] for name in ("wins", "home", "away", "p_home", "divisions", "leagues")]
+    chunk = max(SIM_BATCH, simulations // (4 * max(workers, 1)))
+    sizes = [min(chunk, simulations - start) for start in range(0, simulations, chunk)]
+    seeds = np.random.SeedSequence().spawn(len(sizes))
+    deadline = time.perf_counter() + budget
+
+    results = []
+    if workers > 1:
+        pending = {get_simulation_pool().submit(simulate_seasons, *args, size, seed) for size, seed in zip(sizes, seeds)}
+        while pending:
+            timeout = max(deadline - time.perf_counter(), 0) if results else None
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            results += [future.result() for future in done]
+            if not done:
+                for future in pending:
+                    future.cancel()
+                break
+    else:
+        for size, seed in zip(sizes, seeds):
+            results.append(simulate_seasons(*args, size, seed))
+            if time.perf_counter() >= deadline:
+                break
+
+    completed = sum(size for size, _ in results)
+    count("mlb_simulated_seasons", completed)
+    if completed < simulations:
+        count("mlb_simulation_budget_exceeded")
+    totals = {name: sum(result[name] for _, result in results) for name in ("wins", "division", "wild_card")}
+    return completed, totals
+
+# Projected record and playoff odds per team from the simulated seasons
+def projection_table(inputs, completed, totals):
+    remaining = np.bincount(inputs["home"], minlength=len(inputs["teams"])) + np.bincount(inputs["away"], minlength=len(inputs["teams"]))
+    projected_wins = totals["wins"] / completed
+    odds = pd.DataFrame({
+        'Division': [team_divisions[abbr] for abbr in inputs["teams"]],
+        'W': inputs["wins"],
+        'L': inputs["losses"],
+        'Proj W': projected_wins.round(1),
+        'Proj L': (inputs["wins"] + inputs["losses"] + remaining - projected_wins).round(1),
+        'Division %': (100 * totals["division"] / completed).round(1),
+        'Wild Card %': (100 * totals["wild_card"] / completed).round(1),
+    }, index=pd.Index(inputs["teams"], name='Team'))
+    odds['Playoff %'] = odds['Division %'] + odds['Wild Card %']
+    return odds.sort_values(['Playoff %', 'Proj W'], ascending=False)
+
+# Rest-of-season projection for a season, from the given standings (get_standings by default).
+# It's cached per standings snapshot: the inputs are hashed, so the same W-L records, remaining
+# games and team strengths reuse the last result whichever session or copy of the standings asks.
+def get_season_projection(year, standings=None, simulations=SIMULATIONS, budget=SIM_BUDGET):
+    standings = get_standings(year) if standings is None else standings
+    inputs = projection_inputs(year, standings)
+    digest = hashlib.sha1(str(simulations).encode())
+    for name in ("wins", "home", "away", "p_home"):
+        digest.update(np.ascontiguousarray(inputs[name]).tobytes())
+    digest = digest.hexdigest()
+
+    key = f"season_projection_{year}"
+    memory = get_memory_cache()
+
+    def current():
+        entry = memory.get(key)
+        return entry[1] if entry is not None and entry[0] == digest else None
+
+    def build():
+        projection = current()
+        if projection is None:
+            start = time.perf_counter()
+            with timed("mlb_fetch_seconds", fetcher="season_projection"):
+                completed, totals = run_simulations(inputs, simulations, budget)
+            projection = {
+                "odds": projection_table(inputs, completed, totals),
+                "simulations": completed,
+                "games": len(inputs["home"]),
+                "seconds": time.perf_counter() - start,
+            }
+            memory[key] = (digest, projection)
+        return projection
+
+    projection = current()
+    return projection if projection is not None else single_flight(key, build)
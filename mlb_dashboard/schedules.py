@@ -0,0 +1,229 @@
+import pandas as pd
+import numpy as np
+import datetime
+import re
+import math
+import time
+
+from mlb_dashboard.metrics import count
+from mlb_dashboard.teams import get_team_abbreviation, mlb_teams, statsapi_team_abbreviation
+from mlb_dashboard.cache import season_cache
+from mlb_dashboard.upstream import statsapi_get_json
+from mlb_dashboard.sources import pybaseball
+
+# Convert Baseball-Reference schedule dates ("Monday, Apr 1", or "Monday, Apr 1 (1)" for
+# doubleheaders) to datetimes with vectorized string ops and one bulk parse
+def convert_dates(df, year=None):
+    # Remove any content in parentheses and trim whitespace
+    dates = df['Date'].astype(str).str.replace(r'\s*\([^)]*\)', '', regex=True).str.strip()
+
+    if year is not None:
+        # A season never crosses New Year, so every game is in the requested year
+        parsed = pd.to_datetime(f"{year} " + dates, format="%Y %A, %b %d", errors="coerce")
+    else:
+        # Without a season, use the current year and move dates that land in the future back a year
+        now = datetime.datetime.now()
+        parsed = pd.to_datetime(f"{now.year} " + dates, format="%Y %A, %b %d", errors="coerce")
+        parsed = parsed.where(~(parsed > now), parsed - pd.DateOffset(years=1))
+
+    # Anything not in the schedule format gets pandas' general parser
+    unparsed = parsed.isna() & df['Date'].notna()
+    if unparsed.any():
+        parsed[unparsed] = pd.to_datetime(dates[unparsed], errors="coerce")
+
+    return df.assign(Date=parsed)
+
+# The original per-row converter, kept as the baseline for benchmark_convert_dates
+def convert_dates_rowwise(df):
+    # Get the current year
+    current_year = datetime.datetime.now().year
+
+    # Function to add year and convert to ISO format
+    def add_year_and_convert(date_str):
+        try:
+            # Remove any content in parentheses and trim whitespace
+            date_str = re.sub(r'\s*\([^)]*\)', '', date_str).strip()
+
+            # Parse the date string
+            date_obj = datetime.datetime.strptime(date_str, "%A, %b %d")
+            
+            # Add the current year
+            date_with_year = date_obj.replace(year=current_year)
+            
+            # If the resulting date is in the future, subtract a year
+            if date_with_year > datetime.datetime.now():
+                date_with_year = date_with_year.replace(year=current_year - 1)
+            
+            # Convert to ISO format
+            return date_with_year.date().isoformat()
+        except ValueError:
+            # Return original string if parsing fails
+            return date_str
+
+    # Apply the conversion to the 'Date' column
+    df['Date'] = df['Date'].apply(add_year_and_convert)
+    
+    # Convert the 'Date' column to datetime
+    df['Date'] = pd.to_datetime(df['Date'])
+    
+    return df
+
+# Synthetic Baseball-Reference style schedule for benchmarks: every team plays daily from April 1st,
+# with a doubleheader suffix every tenth game
+def make_benchmark_schedule(year, teams=30, games=162):
+    days = pd.date_range(datetime.date(year, 4, 1), periods=games)
+    dates = [f"{day:%A}, {day:%b} {day.day}" + (" (1)" if i % 10 == 9 else "") for i, day in enumerate(days)]
+    return pd.DataFrame({'Date': dates * teams, 'Tm': np.repeat(list(mlb_teams)[:teams], games)})
+
+# Time convert_dates against the per-row version on multi-season, all-team schedule frames
+def benchmark_convert_dates(seasons=5, repeat=3):
+    end_year = datetime.datetime.now().year - 1
+    frames = [make_benchmark_schedule(year) for year in range(end_year - seasons + 1, end_year + 1)]
+    rows = sum(len(frame) for frame in frames)
+
+    def best_time(convert):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for year, frame in zip(range(end_year - seasons + 1, end_year + 1), frames):
+                convert(frame.copy(), year)
+            timings.append(time.perf_counter() - start)
+        return min(timings)
+
+    vectorized = best_time(lambda frame, year: convert_dates(frame, year))
+    rowwise = best_time(lambda frame, year: convert_dates_rowwise(frame))
+
+    # The per-row version stamps every season with the current year, so only compare month and day
+    expected = convert_dates_rowwise(frames[-1].copy())['Date']
+    actual = convert_dates(frames[-1], end_year)['Date']
+    matches = (expected.dt.strftime("%m-%d") == actual.dt.strftime("%m-%d")).all()
+
+    print(f"{seasons} seasons x 30 teams = {rows} rows")
+    print(f"per-row:    {rowwise * 1000:.1f} ms")
+    print(f"vectorized: {vectorized * 1000:.1f} ms ({rowwise / vectorized:.0f}x faster)")
+    print(f"results match: {matches}")
+    return rowwise, vectorized
+
+# Function to get a team's schedule and results
+@season_cache("schedule")
+def get_schedule(year, abbr):
+    return pybaseball.schedule_and_record(year, abbr)
+
+def get_last_week(year,team,schedule_df=None):
+    try:
+        if schedule_df is None:
+            # Convert the 'Date' column to datetime
+            df = convert_dates(get_schedule(year,get_team_abbreviation(team)), year)
+        else:
+            df = schedule_df
+        #df['Date'] = pd.to_datetime(df['Date'], format='%A, %b %d')
+
+        # Get today's date, clamped to the last scheduled date so a finished season reports its
+        # final week
+        today = min(datetime.datetime.now().date(), df['Date'].max().date())
+
+        # Check if there are any dates after today
+        future_dates = df[df['Date'].dt.date > today]
+
+        if not future_dates.empty:
+            print(f"There are {len(future_dates)} games scheduled after today.")
+
+        # Find games in the last 7 days
+        seven_days_ago = today - datetime.timedelta(days=7)
+        recent_games = df[(df['Date'].dt.date <= today) & (df['Date'].dt.date > seven_days_ago)]
+
+        # Count W's and L's
+        wins = recent_games['W/L'].str.startswith('W').sum()
+        losses = recent_games['W/L'].str.startswith('L').sum()
+        # Nothing played in the last week yet, e.g. in the preseason
+        if recent_games.empty:
+            return wins, losses, 0
+        if math.isnan(recent_games['Streak'].iloc[-1]):
+            streak = recent_games.iloc[[-2]]['Streak']
+        else:
+            streak = recent_games.iloc[[-1]]['Streak'] 
+        #print(streak)
+        return wins, losses, streak
+    except Exception as e:
+        print(f"Error fetching schedule from pybaseball: {e}")
+        count("mlb_fallbacks", dataset="last_week", source="statsapi")
+        return get_last_week_statsapi(year, team)
+
+def get_last_week_statsapi(year, team):
+    league_schedule = get_league_schedule(year)
+    abbr = get_team_abbreviation(team)
+    # A finished season reports its final week
+    today = min(datetime.date.today(), league_schedule.loc[abbr].index.get_level_values('Date').max().date())
+    wins, losses = team_last_week(league_schedule, abbr, today)
+    return wins, losses, team_streak(league_schedule, abbr)
+
+# League-wide schedule from a single statsapi call, one row per team per game, indexed by
+# (Team, Date, GameNum). Team and Opp use the mlb_teams abbreviations where the name matches.
+@season_cache("league_schedule")
+def get_league_schedule(year):
+    data = statsapi_get_json('schedule', {'sportId': 1, 'season': year, 'gameType': 'R', 'hydrate': 'linescore'})
+    return league_schedule_from_json(data)
+
+# Reshape a statsapi schedule response into the league schedule frame
+def league_schedule_from_json(data):
+    games = pd.json_normalize([game for date in data.get('dates', []) for game in date['games']])
+    columns = ['Team', 'Date', 'GameNum', 'Home_Away', 'Opp', 'R', 'RA', 'W/L', 'Inn', 'Status', 'gamePk']
+    if games.empty:
+        return pd.DataFrame(columns=columns).set_index(['Team', 'Date', 'GameNum'])
+
+    # Postponed and cancelled games show up again on their makeup date
+    games = games[~games['status.detailedState'].isin(['Postponed', 'Cancelled'])]
+    final = games['status.abstractGameState'] == 'Final'
+    # Scores and linescores are missing when none of the games have started
+    for column in ['teams.home.score', 'teams.away.score', 'linescore.currentInning']:
+        if column not in games:
+            games[column] = np.nan
+
+    def abbreviations(side):
+        return [statsapi_team_abbreviation({'id': team_id, 'name': name})
+                for team_id, name in zip(games[f'teams.{side}.team.id'], games[f'teams.{side}.team.name'])]
+
+    def side(team, opponent, home_away):
+        runs = games[f'teams.{team}.score']
+        runs_against = games[f'teams.{opponent}.score']
+        return pd.DataFrame({
+            'Team': abbreviations(team),
+            'Date': pd.to_datetime(games['officialDate']),
+            'GameNum': games['gameNumber'],
+            'Home_Away': home_away,
+            'Opp': abbreviations(opponent),
+            'R': runs.where(final),
+            'RA': runs_against.where(final),
+            'W/L': np.where(final, np.where(runs > runs_against, 'W', 'L'), None),
+            'Inn': games['linescore.currentInning'].where(final),
+            'Status': games['status.detailedState'],
+            'gamePk': games['gamePk'],
+        })
+
+    schedule = pd.concat([side('home', 'away', 'Home'), side('away', 'home', '@')], ignore_index=True)
+    return schedule.set_index(['Team', 'Date', 'GameNum']).sort_index()
+
+# Wins and losses in the 7 days up to today, an index slice on the league schedule
+def team_last_week(league_schedule, abbr, today=None):
+    today = pd.Timestamp(today or datetime.date.today())
+    games = league_schedule.loc[abbr]
+    recent = games.loc[today - pd.Timedelta(days=6):today]
+    return int((recent['W/L'] == 'W').sum()), int((recent['W/L'] == 'L').sum())
+
+# Current streak, positive for wins and negative for losses like Baseball-Reference's Streak column
+def team_streak(league_schedule, abbr):
+    results = league_schedule.loc[abbr, 'W/L'].dropna().to_numpy()
+    if len(results) == 0:
+        return 0
+    last = results[-1]
+    changed = results[::-1] != last
+    length = int(changed.argmax()) if changed.any() else len(results)
+    return length if last == 'W' else -length
+
+# Last-7-days record and streak for every team at once, e.g. for a league table or streak leaderboard
+def league_recent_form(league_schedule, today=None):
+    return pd.DataFrame(
+        [(abbr, *team_last_week(league_schedule, abbr, today), team_streak(league_schedule, abbr))
+         for abbr in league_schedule.index.get_level_values('Team').unique()],
+        columns=['Team', 'W', 'L', 'Streak'],
+    ).set_index('Team')
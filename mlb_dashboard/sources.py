@@ -0,0 +1,85 @@
+import streamlit as st
+import requests
+import importlib
+import hashlib
+import gzip
+import pickle
+import os
+import re
+from pathlib import Path
+
+from mlb_dashboard.config import DATA_SOURCE, SNAPSHOT_DIR
+from mlb_dashboard.metrics import count
+
+#pybaseball scrapes data from:  https://www.baseball-reference.com/, https://baseballsavant.mlb.com/, and https://www.fangraphs.com/.
+
+# Raised when replaying a request that was never recorded. It's a connection error, so every
+# caller handles it the same way it handles being offline.
+class SnapshotMissing(requests.ConnectionError):
+    pass
+
+# Where upstream data comes from. "live" calls pybaseball and the network, "record" does the same
+# and also writes every response to a gzipped pickle under snapshot_dir, and "replay" serves only
+# those snapshots and never touches the network.
+class DataSource:
+    def __init__(self, mode, snapshot_dir):
+        if mode not in ("live", "record", "replay"):
+            raise ValueError(f"Unknown data source {mode!r}, expected live, record or replay")
+        self.mode = mode
+        self.snapshot_dir = Path(snapshot_dir)
+
+    # Snapshots are named after the request so the directory is browsable, the digest tells apart
+    # requests with the same name
+    def snapshot_path(self, kind, name, request):
+        digest = hashlib.sha1(repr(request).encode()).hexdigest()[:16]
+        name = re.sub(r'[^\w.-]', '_', name)
+        return self.snapshot_dir / kind / f"{name}_{digest}.pkl.gz"
+
+    # Return the response to a request, calling live() for it unless we're replaying
+    def fetch(self, kind, name, request, live):
+        path = self.snapshot_path(kind, name, request)
+        if self.mode == "replay":
+            try:
+                with gzip.open(path, "rb") as f:
+                    value = pickle.load(f)
+            except FileNotFoundError:
+                count("mlb_snapshots", kind=kind, result="missing")
+                raise SnapshotMissing(f"No recorded {kind} snapshot for {name} in {self.snapshot_dir}")
+            count("mlb_snapshots", kind=kind, result="replayed")
+            return value
+
+        value = live()
+        if self.mode == "record":
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            with gzip.open(tmp_path, "wb") as f:
+                pickle.dump(value, f)
+            os.replace(tmp_path, path)
+            count("mlb_snapshots", kind=kind, result="recorded")
+        return value
+
+    # Number of snapshots and their size on disk, per kind
+    def summary(self):
+        return {kind.name: (len(files), sum(path.stat().st_size for path in files))
+                for kind in sorted(self.snapshot_dir.glob("*")) if kind.is_dir()
+                for files in [list(kind.glob("*.pkl.gz"))]}
+
+# The process's data source, picked with MLB_DATA_SOURCE and MLB_SNAPSHOT_DIR
+@st.cache_resource
+def get_data_source():
+    return DataSource(DATA_SOURCE, SNAPSHOT_DIR)
+
+# Stand-in for a scraper module: calling one of its functions goes through the data source.
+# The module itself is imported on the first live call, pybaseball takes over a second to import
+# (it pulls in matplotlib and its plotting helpers) and a page served from the cache never calls it.
+class SourceModule:
+    def __init__(self, name):
+        self.name = name
+
+    def __getattr__(self, attr):
+        def call(*args):
+            live = lambda: getattr(importlib.import_module(self.name), attr)(*args)
+            return get_data_source().fetch(self.name, "_".join([attr] + [str(arg) for arg in args]), (attr, args), live)
+        return call
+
+pybaseball = SourceModule("pybaseball")
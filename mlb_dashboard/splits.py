@@ -0,0 +1,81 @@
+import pandas as pd
+import numpy as np
+import calendar
+
+from mlb_dashboard.cache import get_memory_cache, single_flight
+from mlb_dashboard.metrics import count
+
+# Splits a team's record is broken down by. Every finished game falls in one group of each split.
+split_names = ['Location', 'Month', 'Opponent', 'Margin', 'Innings']
+split_columns = ['W', 'L', 'R', 'RA']
+group_order = {'Home': 0, 'Away': 1, 'One-run': 0, 'Other': 1, 'Regulation': 0, 'Extra': 1,
+               **{month: i for i, month in enumerate(calendar.month_abbr)}}
+
+# One row per finished game of a Baseball-Reference schedule (dates already converted) with its
+# group in every split
+def split_keys(schedule_df):
+    games = schedule_df[schedule_df['W/L'].notna()]
+    result = games['W/L'].astype(str).str[0]
+    runs = pd.to_numeric(games['R'], errors='coerce')
+    runs_against = pd.to_numeric(games['RA'], errors='coerce')
+    innings = pd.to_numeric(games['Inn'], errors='coerce')
+    return pd.DataFrame({
+        'Location': np.where(games['Home_Away'] == '@', 'Away', 'Home'),
+        'Month': games['Date'].dt.strftime('%b'),
+        'Opponent': games['Opp'],
+        'Margin': np.where((runs - runs_against).abs() == 1, 'One-run', 'Other'),
+        'Innings': np.where(innings > 9, 'Extra', 'Regulation'),
+        'W': (result == 'W').astype(int),
+        'L': (result == 'L').astype(int),
+        'R': runs.fillna(0),
+        'RA': runs_against.fillna(0),
+    }, index=games.index)
+
+# Wins, losses and runs for every group of every split, in a single groupby over the games
+# melted to one row per (game, split)
+def aggregate_splits(keys):
+    long = keys.melt(id_vars=split_columns, value_vars=split_names, var_name='Split', value_name='Group')
+    return long.groupby(['Split', 'Group'])[split_columns].sum()
+
+# Add games, win % and run differential, and put the splits in display order
+def finish_splits(totals):
+    splits = totals.astype(int)
+    splits.insert(0, 'G', splits['W'] + splits['L'])
+    splits['W-L%'] = (splits['W'] / splits['G']).round(3)
+    splits['Run Diff'] = splits['R'] - splits['RA']
+    order = sorted(splits.index, key=lambda key: (split_names.index(key[0]), group_order.get(key[1], len(group_order)), key[1]))
+    return splits.loc[order]
+
+# Record splits for one team and season, indexed by (Split, Group). Totals are kept per
+# (season, team) with the schedule rows they include. Asking again with the same schedule
+# snapshot returns them as they are, a new snapshot only adds the games that have finished since.
+def get_team_splits(year, abbr, schedule_df):
+    key = f"team_splits_{year}_{abbr}"
+    state = get_memory_cache().get(key)
+    if state is not None and state["source"] is schedule_df:
+        return state["splits"]
+    return single_flight(key, lambda: update_team_splits(key, schedule_df))
+
+def update_team_splits(key, schedule_df):
+    memory = get_memory_cache()
+    state = memory.get(key)
+    if state is not None and state["source"] is schedule_df:
+        return state["splits"]
+
+    finished = schedule_df.index[schedule_df['W/L'].notna()]
+    if state is None or not state["games"].isin(finished).all():
+        # First build, or a game that was counted isn't finished anymore (e.g. a suspended game)
+        games = finished
+        totals = aggregate_splits(split_keys(schedule_df.loc[finished]))
+        count("mlb_split_games", len(finished), update="full")
+    else:
+        new_games = finished.difference(state["games"])
+        games = state["games"].append(new_games)
+        totals = state["totals"]
+        if len(new_games):
+            totals = totals.add(aggregate_splits(split_keys(schedule_df.loc[new_games])), fill_value=0)
+        count("mlb_split_games", len(new_games), update="incremental")
+
+    splits = finish_splits(totals)
+    memory[key] = {"source": schedule_df, "games": games, "totals": totals, "splits": splits}
+    return splits
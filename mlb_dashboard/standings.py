@@ -0,0 +1,159 @@
+import streamlit as st
+import pandas as pd
+import numpy as np
+import datetime
+import time
+import threading
+
+from mlb_dashboard.config import SEASON_GAMES, STANDINGS_SYNC_INTERVAL
+from mlb_dashboard.metrics import count
+from mlb_dashboard.teams import division_names, mlb_teams, statsapi_team_abbreviation, team_divisions
+from mlb_dashboard.schedules import get_league_schedule, league_recent_form, league_schedule_from_json
+from mlb_dashboard.cache import get_memory_cache, read_disk_cache, season_cache, write_disk_cache
+from mlb_dashboard.upstream import statsapi_get_json
+from mlb_dashboard.sources import pybaseball
+
+# Function to get standings
+@season_cache("standings")
+def get_standings(year):
+    try:
+        all_standings = pybaseball.standings(year)
+        # Combine all divisions into a single DataFrame, Baseball-Reference lists them in division_names order
+        combined_standings = pd.concat(all_standings, keys=division_names, names=['Division'])
+        # Reset index to make 'Tm' and 'Division' columns
+        combined_standings = combined_standings.reset_index(level='Division').reset_index(drop=True)
+        return combined_standings[[col for col in combined_standings.columns if col != 'Division'] + ['Division']]
+    except Exception as e:
+        print(f"Error fetching standings from pybaseball: {e}")
+        count("mlb_fallbacks", dataset="standings", source="statsapi")
+        return get_standings_statsapi(year)
+
+# Standings from statsapi's structured standings JSON, in the same columns as the pybaseball path
+def get_standings_statsapi(year):
+    data = statsapi_get_json('standings', {'leagueId': '103,104', 'season': year, 'standingsTypes': 'regularSeason'})
+    records = pd.json_normalize([team for record in data.get('records', []) for team in record['teamRecords']])
+    if records.empty:
+        return pd.DataFrame(columns=['Tm', 'W', 'L', 'W-L%', 'GB', 'E#', 'Division'])
+
+    abbrs = [statsapi_team_abbreviation({'id': team_id, 'name': name}) for team_id, name in zip(records['team.id'], records['team.name'])]
+    standings_data = pd.DataFrame({
+        'Tm': [mlb_teams.get(abbr, abbr) for abbr in abbrs],
+        'W': records['wins'].astype(int),
+        'L': records['losses'].astype(int),
+        'W-L%': pd.to_numeric(records['winningPercentage'], errors='coerce').round(3),
+        # statsapi marks the division leader with "-" where Baseball-Reference uses "--"
+        'GB': records['gamesBack'].replace('-', '--'),
+        'E#': records['eliminationNumber'].replace('-', '--'),
+        'Division': [team_divisions.get(abbr) for abbr in abbrs],
+    })
+    return standings_data
+
+# Standings columns that depend only on W and L: W-L%, and GB and E# within each division
+def finish_standings(standings):
+    standings = standings.copy()
+    standings['Division'] = standings.index.map(team_divisions)
+    standings['Tm'] = standings.index.map(mlb_teams)
+    played = standings['W'] + standings['L']
+    standings['W-L%'] = (standings['W'] / played.where(played > 0)).fillna(0).round(3)
+    leader = (standings['W'] - standings['L']).groupby(standings['Division']).transform('idxmax')
+    leader_w = standings['W'].loc[leader].set_axis(standings.index)
+    leader_l = standings['L'].loc[leader].set_axis(standings.index)
+    games_back = ((leader_w - standings['W']) + (standings['L'] - leader_l)) / 2
+    standings['GB'] = games_back.map(lambda gb: '--' if gb <= 0 else f"{gb:.1f}")
+    elimination = SEASON_GAMES + 1 - leader_w - standings['L']
+    standings['E#'] = np.where(games_back <= 0, '--', np.where(elimination <= 0, 'E', elimination.astype(str)))
+    return standings[['Tm', 'W', 'L', 'W-L%', 'GB', 'E#', 'Division', 'Last7 W', 'Last7 L', 'Streak']]
+
+# Full rebuild of the standings from a league schedule, the reference the incremental sync is checked against
+def standings_from_schedule(league_schedule, today=None):
+    results = league_schedule['W/L'].dropna()
+    standings = pd.DataFrame({
+        'W': (results == 'W').groupby(level='Team').sum(),
+        'L': (results == 'L').groupby(level='Team').sum(),
+    }).reindex(list(team_divisions), fill_value=0).astype(int)
+    return finish_standings(add_recent_form(standings, league_schedule, today))
+
+def add_recent_form(standings, league_schedule, today=None):
+    form = league_recent_form(league_schedule, today).reindex(standings.index, fill_value=0)
+    return standings.assign(**{'Last7 W': form['W'], 'Last7 L': form['L'], 'Streak': form['Streak']})
+
+@st.cache_resource
+def get_standings_sync_lock():
+    return threading.Lock()
+
+# Bring the season's standings up to date by fetching only the games since the last sync and
+# applying them as deltas to W and L. W-L%, GB, E#, streak and the 7-day window are refreshed
+# from the updated state. The state is kept in memory and on disk between syncs. The standings
+# frame is shared like a season_cache snapshot, a sync that changes nothing returns the same
+# object so values derived from it are reused. Copy it before changing it.
+def sync_standings(year, force=False):
+    key = f"standings_state_{year}"
+    with get_standings_sync_lock():
+        memory = get_memory_cache()
+        state = memory.get(key) or read_disk_cache(key)
+        today = datetime.date.today()
+
+        if state is None:
+            # First sync of the season is a full rebuild
+            schedule = get_league_schedule.refresh(year)
+            final = schedule[schedule['W/L'].notna()]
+            state = {
+                "synced_at": time.time(),
+                "synced_through": today,
+                "schedule": schedule,
+                "applied": set(final['gamePk']),
+                "standings": standings_from_schedule(schedule, today),
+            }
+        elif force or time.time() - state["synced_at"] >= STANDINGS_SYNC_INTERVAL:
+            # Start a day early to pick up late finishes from the last synced day
+            start_date = state["synced_through"] - datetime.timedelta(days=1)
+            data = statsapi_get_json('schedule', {
+                'sportId': 1, 'season': year, 'gameType': 'R', 'hydrate': 'linescore',
+                'startDate': start_date.isoformat(), 'endDate': today.isoformat(),
+            })
+            window = league_schedule_from_json(data)
+
+            # Replace the synced window in the schedule with the fresh rows
+            schedule = state["schedule"]
+            dates = schedule.index.get_level_values('Date')
+            schedule = pd.concat([schedule[(dates < pd.Timestamp(start_date)) | (dates > pd.Timestamp(today))], window]).sort_index()
+
+            # Only games that went Final since the last sync change W and L
+            new_games = window[window['W/L'].notna() & ~window['gamePk'].isin(state["applied"])]
+            new_results = new_games['W/L']
+            deltas = pd.DataFrame({
+                'W': (new_results == 'W').groupby(level='Team').sum(),
+                'L': (new_results == 'L').groupby(level='Team').sum(),
+            }).reindex(state["standings"].index, fill_value=0).astype(int)
+            standings = state["standings"][['W', 'L']] + deltas
+
+            state = {
+                "synced_at": time.time(),
+                "synced_through": today,
+                "schedule": schedule,
+                "applied": state["applied"] | set(new_games['gamePk']),
+                "standings": finish_standings(add_recent_form(standings, schedule, today)),
+            }
+        else:
+            return state["standings"]
+
+        memory[key] = state
+        write_disk_cache(key, state)
+        return state["standings"]
+
+# The league schedule the synced standings were last updated from, so games that went Final since
+# the cached schedule was fetched aren't still listed as remaining
+def current_league_schedule(year):
+    state = get_memory_cache().get(f"standings_state_{year}")
+    return state["schedule"] if state is not None else get_league_schedule(year)
+
+# Check the incrementally synced standings against a full rebuild from a fresh season schedule
+def verify_incremental_standings(year):
+    incremental = sync_standings(year, force=True)
+    rebuilt = standings_from_schedule(get_league_schedule.refresh(year), datetime.date.today())
+    try:
+        pd.testing.assert_frame_equal(incremental, rebuilt)
+        return True
+    except AssertionError as e:
+        print(f"Incremental standings differ from a full rebuild: {e}")
+        return False
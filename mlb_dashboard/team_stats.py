@@ -0,0 +1,218 @@
+import pandas as pd
+import numpy as np
+import datetime
+import time
+import os
+
+from mlb_dashboard.config import TEAM_STATS_STORE
+from mlb_dashboard.teams import category_columns, statsapi_team_abbreviation, team_dashboard_columns
+from mlb_dashboard.metrics import count
+from mlb_dashboard.cache import is_fallback, season_cache, season_end
+from mlb_dashboard.upstream import fetch_all, first_split_stat, statsapi_get_json
+from mlb_dashboard.sources import pybaseball
+
+# Function to get team data. Only the columns the dashboard uses are kept in memory, with compact
+# dtypes. Pass columns to load others on demand: from the columnar store for a stored season,
+# else from the full frame in the disk cache.
+def get_team_data(year, columns=None):
+    if columns is None:
+        return get_team_data_compact(year)
+    stored = read_team_season(year, columns)
+    if stored is not None:
+        return compact_frame(stored)
+    return project_team_data(get_team_data_full(year), columns)
+
+def project_team_data(df, columns):
+    return compact_frame(df[[col for col in columns if col in df.columns]])
+
+@season_cache("team_data_compact")
+def get_team_data_compact(year):
+    return project_team_data(get_team_data_full(year), team_dashboard_columns)
+
+# Refetch the full frame and rebuild the projection from it, e.g. for the prefetcher
+def refresh_team_data(year):
+    get_team_data_full.refresh(year)
+    return get_team_data_compact.refresh(year)
+
+get_team_data.refresh = refresh_team_data
+
+# All team batting and pitching columns. They're cached on disk only, a read projects them and
+# lets the full frame go.
+@season_cache("team_data", memory=False)
+def get_team_data_full(year):
+    # Finished seasons are read from the local columnar store once they've been ingested
+    if int(year) < datetime.datetime.now().year:
+        stored = read_team_season(year)
+        if stored is not None:
+            return stored
+        team_data = fetch_team_data(year)
+        # A statsapi fallback frame is served but never stored, the season is fetched from
+        # FanGraphs again once the cache entry expires
+        if not is_fallback(team_data):
+            write_team_season(team_data, year)
+        return team_data
+    return fetch_team_data(year)
+
+def fetch_team_data(year):
+    try:
+        batting = pybaseball.team_batting(year).set_index('Team')
+        pitching = pybaseball.team_pitching(year).set_index('Team')
+        #print(pitching.columns)
+        pitching = pitching.rename(columns={"R":"RA"})
+        # Combine batting and pitching data, keeping only unique columns
+        combined = pd.concat([batting, pitching], axis=1)
+        return combined.loc[:, ~combined.columns.duplicated()]
+    except Exception as e:
+        print(f"Error fetching team data from pybaseball: {e}")
+        count("mlb_fallbacks", dataset="team_data", source="statsapi")
+        return get_team_data_statsapi(year)
+
+# statsapi team stat names for the FanGraphs columns they match, per stat group
+statsapi_team_columns = {
+    'hitting': {'gamesPlayed': 'G', 'runs': 'R', 'hits': 'H', 'homeRuns': 'HR', 'baseOnBalls': 'BB', 'strikeOuts': 'SO',
+                'stolenBases': 'SB', 'avg': 'AVG', 'obp': 'OBP', 'slg': 'SLG', 'ops': 'OPS'},
+    'pitching': {'wins': 'W', 'losses': 'L', 'runs': 'RA', 'earnedRuns': 'ER', 'era': 'ERA', 'whip': 'WHIP',
+                 'inningsPitched': 'IP', 'homeRuns': 'HR_allowed', 'baseOnBalls': 'BB_allowed',
+                 'hitByPitch': 'HBP_allowed', 'strikeOuts': 'SO_pitching'},
+}
+
+# Innings pitched are written in outs, "80.1" is 80 1/3 innings
+def innings_from_ip(ip):
+    ip = pd.to_numeric(ip, errors='coerce')
+    whole = np.floor(ip)
+    return whole + ((ip - whole) * 10).round() / 3
+
+# Team stats from statsapi in the FanGraphs column schema (R, RA, AVG, ERA, FIP...) so every
+# reader of team_data works on either source. WAR has no statsapi equivalent and is left empty.
+# The frame is marked as a fallback so it's never written to the season store.
+def get_team_data_statsapi(year):
+    teams = statsapi_get_json('teams', {'sportId': 1, 'season': year})['teams']
+
+    def fetch_team_stats(request):
+        team, group = request
+        data = statsapi_get_json(f"teams/{team['id']}/stats", {'group': group, 'stats': 'season', 'season': year})
+        return first_split_stat(data) or {}
+
+    requests_list = [(team, group) for team in teams for group in ('hitting', 'pitching')]
+    results = fetch_all(fetch_team_stats, requests_list)
+    team_data = []
+    for i, team in enumerate(teams):
+        # Keyed by abbreviation, statsapi's club names change (e.g. "Athletics")
+        row = {'Team': statsapi_team_abbreviation(team)}
+        for group, stats in zip(('hitting', 'pitching'), results[2 * i:2 * i + 2]):
+            row.update({column: stats.get(name) for name, column in statsapi_team_columns[group].items()})
+        team_data.append(row)
+    team_data = pd.DataFrame(team_data).set_index('Team').apply(pd.to_numeric, errors='coerce')
+
+    # FIP with the constant that puts league FIP on the league ERA scale
+    innings = innings_from_ip(team_data['IP']).where(lambda ip: ip > 0)
+    fip_core = 13 * team_data['HR_allowed'] + 3 * (team_data['BB_allowed'] + team_data['HBP_allowed'].fillna(0)) - 2 * team_data['SO_pitching']
+    league_innings = innings.sum()
+    constant = ((team_data['ERA'] * innings).sum() - fip_core.sum()) / league_innings if league_innings > 0 else np.nan
+    team_data['FIP'] = (fip_core / innings + constant).round(2)
+    team_data['WAR'] = np.nan
+    team_data = team_data.drop(columns=['IP', 'HR_allowed', 'BB_allowed', 'HBP_allowed', 'SO_pitching'])
+    team_data.attrs["fallback"] = "statsapi"
+    return team_data
+
+# Shrink a stats frame: counting stats to the smallest integer type that fits, rate stats to
+# float32 and identifiers to categoricals. Text columns that hold numbers are converted first.
+def compact_frame(df):
+    df = df.copy()
+    for col in df.columns:
+        values = df[col]
+        if col in category_columns:
+            df[col] = values.astype('category')
+            continue
+        if values.dtype == object:
+            converted = pd.to_numeric(values, errors='coerce')
+            if converted.notna().sum() != values.notna().sum():
+                continue
+            values = converted
+        if pd.api.types.is_bool_dtype(values) or not pd.api.types.is_numeric_dtype(values):
+            continue
+        if values.notna().all() and (values % 1 == 0).all():
+            df[col] = pd.to_numeric(values, downcast='integer')
+        else:
+            df[col] = values.astype('float32')
+    if df.index.dtype == object:
+        df.index = df.index.astype('category')
+    return df
+
+# Columnar store of team stats, one Parquet file per season under .mlb_cache/team_stats/Season=YYYY/
+def team_season_path(year):
+    return TEAM_STATS_STORE / f"Season={year}" / "part-0.parquet"
+
+# Flatten a get_team_data frame for Parquet. Object columns become numeric where every value
+# converts, the rest become strings so a season always has one type per column.
+def normalize_team_data(df):
+    df = df.reset_index()
+    df = df.rename(columns={df.columns[0]: 'Team'})
+    for col in df.columns.drop('Team'):
+        if df[col].dtype == object:
+            converted = pd.to_numeric(df[col], errors='coerce')
+            if converted.notna().sum() == df[col].notna().sum():
+                df[col] = converted
+            else:
+                df[col] = df[col].astype(str)
+    return df
+
+# Only finished seasons are stored, a season in progress would be served as final once the year changes
+def write_team_season(df, year):
+    if time.time() < season_end(year):
+        print(f"Not storing team stats for {year}, the season isn't finished")
+        return
+    try:
+        path = team_season_path(year)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        normalize_team_data(df).to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        print(f"Error writing team stats for {year}: {e}")
+
+def read_team_season(year, columns=None):
+    path = team_season_path(year)
+    # A file written before the season ended holds partial stats, it's refetched instead
+    if not path.exists() or path.stat().st_mtime < season_end(year):
+        return None
+    try:
+        if columns is not None:
+            columns = ['Team'] + [col for col in columns if col != 'Team']
+        return pd.read_parquet(path, columns=columns, memory_map=True).set_index('Team')
+    except Exception as e:
+        print(f"Error reading team stats for {year}: {e}")
+        return None
+
+# Cross-season view of the store, one row per team and season. Columns that a season
+# doesn't have (e.g. Statcast before 2015) are NaN.
+def read_team_seasons(years=None, columns=None):
+    if years is None:
+        years = sorted(int(path.name.split("=")[1]) for path in TEAM_STATS_STORE.glob("Season=*"))
+    frames = []
+    for year in years:
+        df = read_team_season(year, columns)
+        if df is not None:
+            frames.append(df.assign(Season=year).reset_index())
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True).set_index(['Season', 'Team'])
+
+# Batch ingest: fetch a range of seasons with bounded parallelism and write each to the store
+def ingest_team_seasons(start, end, max_workers=4):
+    end = min(end, datetime.datetime.now().year - 1)
+
+    def ingest(year):
+        try:
+            team_data = fetch_team_data(year)
+            if is_fallback(team_data):
+                raise RuntimeError("FanGraphs is unavailable, the statsapi fallback isn't stored")
+            write_team_season(team_data, year)
+            return year, None
+        except Exception as e:
+            return year, e
+
+    results = fetch_all(ingest, range(start, end + 1), max_workers=max_workers)
+    for year, error in results:
+        print(f"{year}: {'failed: ' + str(error) if error else 'ok'}")
+    return [year for year, error in results if error is None]
@@ -0,0 +1,199 @@
+# Dictionary of team abbreviations and team names
+mlb_teams = {
+    "ARI": "Arizona Diamondbacks",
+    "ATL": "Atlanta Braves",
+    "BAL": "Baltimore Orioles",
+    "BOS": "Boston Red Sox",
+    "CHC": "Chicago Cubs",
+    "CWS": "Chicago White Sox",
+    "CIN": "Cincinnati Reds",
+    "CLE": "Cleveland Guardians",
+    "COL": "Colorado Rockies",
+    "DET": "Detroit Tigers",
+    "HOU": "Houston Astros",
+    "KCR": "Kansas City Royals",
+    "LAA": "Los Angeles Angels",
+    "LAD": "Los Angeles Dodgers",
+    "MIA": "Miami Marlins",
+    "MIL": "Milwaukee Brewers",
+    "MIN": "Minnesota Twins",
+    "NYM": "New York Mets",
+    "NYY": "New York Yankees",
+    "OAK": "Oakland Athletics",
+    "PHI": "Philadelphia Phillies",
+    "PIT": "Pittsburgh Pirates",
+    "SDP": "San Diego Padres",
+    "SFG": "San Francisco Giants",
+    "SEA": "Seattle Mariners",
+    "STL": "St. Louis Cardinals",
+    "TBR": "Tampa Bay Rays",
+    "TEX": "Texas Rangers",
+    "TOR": "Toronto Blue Jays",
+    "WSN": "Washington Nationals"
+}
+
+# statsapi team ids. Club names change (the Athletics dropped "Oakland"), the ids don't.
+statsapi_team_ids = {
+    109: "ARI", 144: "ATL", 110: "BAL", 111: "BOS", 112: "CHC", 145: "CWS", 113: "CIN", 114: "CLE",
+    115: "COL", 116: "DET", 117: "HOU", 118: "KCR", 108: "LAA", 119: "LAD", 146: "MIA", 158: "MIL",
+    142: "MIN", 121: "NYM", 147: "NYY", 133: "OAK", 143: "PHI", 134: "PIT", 135: "SDP", 137: "SFG",
+    136: "SEA", 138: "STL", 139: "TBR", 140: "TEX", 141: "TOR", 120: "WSN",
+}
+statsapi_team_id_by_abbr = {abbr: team_id for team_id, abbr in statsapi_team_ids.items()}
+
+# Divisions in the order Baseball-Reference lists their standings tables
+division_names = ["AL East", "AL Central", "AL West", "NL East", "NL Central", "NL West"]
+
+# Division of each team, keyed by the abbreviations in mlb_teams
+team_divisions = {
+    "BAL": "AL East", "BOS": "AL East", "NYY": "AL East", "TBR": "AL East", "TOR": "AL East",
+    "CWS": "AL Central", "CLE": "AL Central", "DET": "AL Central", "KCR": "AL Central", "MIN": "AL Central",
+    "HOU": "AL West", "LAA": "AL West", "OAK": "AL West", "SEA": "AL West", "TEX": "AL West",
+    "ATL": "NL East", "MIA": "NL East", "NYM": "NL East", "PHI": "NL East", "WSN": "NL East",
+    "CHC": "NL Central", "CIN": "NL Central", "MIL": "NL Central", "PIT": "NL Central", "STL": "NL Central",
+    "ARI": "NL West", "COL": "NL West", "LAD": "NL West", "SDP": "NL West", "SFG": "NL West",
+}
+
+# FanGraphs abbreviations that differ from mlb_teams
+fangraphs_team_abbreviations = {"CHW": "CWS", "ATH": "OAK"}
+
+# Abbreviations of clubs that have since moved or been renamed, by the franchise's current abbreviation
+franchise_abbreviations = {"FLA": "MIA", "MON": "WSN", "TBD": "TBR", "ANA": "LAA"}
+
+# Team columns kept in memory for the dashboard. The rest are loaded on demand from the store or disk cache.
+team_dashboard_columns = ['G', 'R', 'RA', 'HR', 'AVG', 'OBP', 'SLG', 'OPS', 'wRC+', 'WAR', 'ERA', 'FIP', 'WHIP']
+
+# Player columns kept in memory for the leaderboards
+player_batting_columns = ['Name', 'Tm', 'Lev', 'G', 'PA', 'AB', 'H', 'HR', 'BB', 'SO', 'BA', 'OBP', 'SLG', 'OPS']
+
+player_pitching_columns = ['Name', 'Tm', 'Lev', 'G', 'GS', 'IP', 'H', 'HR', 'BB', 'SO', 'HBP', 'ERA', 'WHIP']
+
+# statsapi stat names for the same player columns
+statsapi_player_columns = {
+    'Team': 'Tm', 'gamesPlayed': 'G', 'gamesStarted': 'GS', 'plateAppearances': 'PA', 'atBats': 'AB',
+    'hits': 'H', 'homeRuns': 'HR', 'baseOnBalls': 'BB', 'strikeOuts': 'SO', 'hitByPitch': 'HBP',
+    'avg': 'BA', 'obp': 'OBP', 'slg': 'SLG', 'ops': 'OPS', 'inningsPitched': 'IP', 'era': 'ERA', 'whip': 'WHIP',
+}
+
+# Identifier columns that repeat a small set of values
+category_columns = ['Team', 'Tm', 'Name', 'Lev', 'Division']
+
+bat_stat_dict = {
+    "TG": "Total Games",
+    "G": "Games Played",
+    "AB": "At Bats",
+    "PA": "Plate Appearances",
+    "H": "Hits",
+    "1B": "Singles",
+    "2B": "Doubles",
+    "3B": "Triples",
+    "HR": "Home Run",
+    "R": "Runs",
+    "RBI": "Runs Batted In",
+    "BB": "Walks",
+    "IBB": "Intential Walks",
+    "SO": "Strikeouts",
+    "HBP": "Hit By Pitch",
+    "SF": "Sacrifice Fly",
+    "SH": "Sacrifice Hit",
+    "GDP": "Ground to Double Play",
+    "SB": "Stolen Bases",
+    "CS": "Caught Stealing",
+    "BB%": "Walk Percentage",
+    "K%": "Strikeout Percentage",
+    "BB/K": "Walk to Strikeout Ratio",
+    "ISO": "Isolated Power (SLG-AVG)",
+    "BAIP": "Batting Average on Balls in Play",
+    "AVG": "Batting Average",
+    "OBP": "On Base Percentage",
+    "SLG": "Slugging Percentage",
+    "OPS": "On Base + Slugging Percentage",
+    "Spd": "Speed Score",
+    "UBR": "Ultimate Base Running",
+    "wGDP": "Ground to Double Play Abave Average",
+    "XBR": "Statcast baserunning average",
+    "wSB": "Stolen Base and Caught Stealing above average",
+    "wOBA": "Weighted On Base Average",
+    "wRC": "Runs Created in terms of wOBA",
+    "wRAA": "Runs Above Average from  wOBA",
+    "wRC+": "Runs per Plate Appearance where 100 is average",
+    "GB/FB": "Ground Ball to Fly Ball Ratio",
+    "LD%": "Line Drive Percentage",
+    "GB%": "Ground Ball Percentage",
+    "FB%": "Fly Ball Percentage",
+    "IFFB%": "Infield Fly Ball Percentage",
+    "HR/FB": "Home Run to Fly Ball Ratio",
+    "IFH": "Infield Hits",
+    "IFH%": "Infield Hit Percentage",
+    "BUH": "Bunt Hits",
+    "BUH%": "Bunt Hit Percentage",
+    "Pull%": "Percentage of Balls Pulled into Play",
+    "Cent%": "Percentage of Balls Hit to Centerfield",
+    "Oppo%": "Percentage of Balls Hit to the Opposite Field",
+    "Soft%": "Percentage of Balls Hit with a soft speed",
+    "Med%": "Percentage of Balls Hit with a Medium Speed",
+    "Hard%": "Percentage of Balls Hit with a Hard Speed",
+    "WPA": "Win Probability Added",
+    "-WPA": "Loss Advancement",
+    "+WPA": "Win Advancement",
+    "RE24": "Runs above average based on 24 run/out states",
+    "REW": "Wins above average based on 24 run/out states",
+    "pLI": "Average Leverage Index",
+    "phLI": "Average Leverage Index while pinch hitting",
+    "PH": "Pinch Hitting Opportunities",
+    "WPA/LI": "Situational Wins",
+    "Clutch": "Performance Under Pressure",
+    "Batting": "Park adjusted runs above average based on wOBA",
+    "Base Running": "Base Running Runs Above Average, includes SB and CS.",
+    "Fielding": "Fielding Runs Above Average based on UZR",
+    "Positional": "Positional Adjustments",
+    "League": "League adjustment to zero out wins above average",
+    "Replacement": "Replacement Runs",
+    "BsR": "Base Running Runs Above Average",
+    "Off": "Offense - Batting and Base Running Above Average",
+    "Def": "Defebse - Fielding and Positional Adjustment",
+    "RAR": "Runs Above Replacement",
+    "WAR": "Wins Above Replacement",
+    "Dollars": "WAR convert to dollars based on free agency",
+    "Events": "Number of batted balls (PA - SO - BB - HBP)",
+    "EV": "Exit Velocity (mph), speed as the ball comes off the bat",
+    "maxEV": "maximum Exit Velocity",
+    "LA": "Launch Angle",
+    "Barrels": "Hit type that could lead to .500 batting average",
+    "Barrels": "Percentage of hits that are Barrels",
+    "HardHit": "Number of hits with an exit velocity of 95mph",
+    "HardHit%": "Percentage of hits that are hard hits",
+    "PPTV": "Pitcher Pitch Timer Violation",
+    "CPTV": "Catcher Pitch Timer Violation",
+    "DGV": "Disengagement Violation",
+    "DSV": "Defensive Shift Violation",
+    "BPTV": "Batter Pitch Timer Violation",
+    "BTV": "Batter Timeout Violation",
+    "EBV": "Total Balls by Violation",
+    "ESV": "Total Strikes by Violation",
+    "wTeamV": "Total Run Value of Violations Commited by the Player/Team",
+    "wOppTeamV": "Total Run Value of Violations Commited by the Opposing Player/Team",
+    "wNetPitV / wNetBatV": "Total Net Run Value for Player/Team"
+}
+
+def get_team_abbreviation(team_name):
+    for abbr, name in mlb_teams.items():
+        if name.lower() == team_name.lower():
+            return abbr
+    return None  # Return None if the team name is not found
+
+# Abbreviation for a statsapi team object, by id and then by name
+def statsapi_team_abbreviation(team):
+    return statsapi_team_ids.get(team.get('id')) or get_team_abbreviation(team.get('name', '')) or team.get('name')
+
+# mlb_teams abbreviation for a team_data index label: a FanGraphs abbreviation, or the club name
+# when the data came from statsapi
+def team_abbreviation(team):
+    team = str(team)
+    if team in mlb_teams:
+        return team
+    return fangraphs_team_abbreviations.get(team) or get_team_abbreviation(team)
+
+# Current franchise abbreviation for a team label of any season, e.g. "MON" is "WSN"
+def franchise_abbreviation(team):
+    return franchise_abbreviations.get(str(team)) or team_abbreviation(team)
@@ -0,0 +1,166 @@
+import pandas as pd
+import datetime
+import os
+
+from mlb_dashboard.config import TRENDS_STORE
+from mlb_dashboard.cache import derived_snapshot, get_memory_cache, is_fallback, season_cache
+from mlb_dashboard.metrics import count
+from mlb_dashboard.schedules import get_league_schedule
+from mlb_dashboard.standings import current_league_schedule
+from mlb_dashboard.team_stats import fetch_team_data, get_team_data, read_team_season, write_team_season
+from mlb_dashboard.teams import franchise_abbreviation, statsapi_team_abbreviation
+from mlb_dashboard.upstream import fetch_all, statsapi_get_json
+
+# Team stats carried into the season rollups, and the stats the trend view can chart
+trend_team_columns = ['OPS', 'ERA']
+trend_metrics = ['Run Diff', 'W-L%', 'W', 'R', 'RA', 'Attendance', 'Avg Attendance', 'OPS', 'ERA']
+
+# Home attendance of every club for a season, from one statsapi request
+@season_cache("attendance")
+def get_attendance(year):
+    data = statsapi_get_json('attendance', {'leagueId': '103,104', 'season': year, 'gameType': 'R'})
+    records = data.get('records', [])
+    return pd.DataFrame({
+        'Attendance': [record.get('attendanceTotalHome') for record in records],
+        'Avg Attendance': [record.get('attendanceAverageHome') for record in records],
+    }, index=[franchise_abbreviation(statsapi_team_abbreviation(record['team'])) for record in records], dtype=float)
+
+# Attendance is only shown in the trends, a season without it still gets its other rollups. The
+# same empty frame is returned every time, so it doesn't look like a new snapshot.
+no_attendance = pd.DataFrame(columns=['Attendance', 'Avg Attendance'], dtype=float)
+
+def attendance_or_empty(year):
+    try:
+        return get_attendance(year)
+    except Exception as e:
+        print(f"Error fetching attendance for {year}: {e}")
+        count("mlb_fallbacks", dataset="attendance", source="none")
+        return no_attendance
+
+# Games, wins, losses and runs per franchise and month from a league schedule, finished games only
+def month_rollup(schedule):
+    games = schedule[schedule['W/L'].notna()]
+    result = games['W/L']
+    return pd.DataFrame({
+        'Franchise': [franchise_abbreviation(team) for team in games.index.get_level_values('Team')],
+        'Month': games.index.get_level_values('Date').month,
+        'G': 1,
+        'W': (result == 'W').astype(int).to_numpy(),
+        'L': (result == 'L').astype(int).to_numpy(),
+        'R': pd.to_numeric(games['R'], errors='coerce').fillna(0).to_numpy(),
+        'RA': pd.to_numeric(games['RA'], errors='coerce').fillna(0).to_numpy(),
+    }).groupby(['Franchise', 'Month']).sum()
+
+def finish_rollup(rollup):
+    rollup['W-L%'] = (rollup['W'] / rollup['G'].where(rollup['G'] > 0)).round(3)
+    rollup['Run Diff'] = rollup['R'] - rollup['RA']
+    return rollup
+
+# Season and month rollups of one season, indexed by (Franchise, Season) and (Franchise, Season,
+# Month). Season totals are the sum of the months, joined with the team stats and attendance.
+def build_season_rollups(year, schedule, team_data, attendance):
+    month = month_rollup(schedule)
+    season = month.groupby(level='Franchise').sum()
+    stats = team_data[team_data.columns.intersection(trend_team_columns)].apply(pd.to_numeric, errors='coerce')
+    stats = stats.set_axis([franchise_abbreviation(team) for team in stats.index])
+    season = season.join(stats.reindex(columns=trend_team_columns)).join(attendance.reindex(columns=['Attendance', 'Avg Attendance']))
+    season = finish_rollup(season).assign(Season=int(year)).set_index('Season', append=True)
+    month = finish_rollup(month).assign(Season=int(year)).set_index('Season', append=True).reorder_levels(['Franchise', 'Season', 'Month'])
+    return season, month
+
+# Rollup store: finished seasons are written once under .mlb_cache/trends/Season=YYYY/ and never rebuilt
+def trend_season_dir(year):
+    return TRENDS_STORE / f"Season={year}"
+
+def write_season_rollups(year, season, month):
+    path = trend_season_dir(year)
+    path.mkdir(parents=True, exist_ok=True)
+    for name, frame in (("season", season), ("month", month)):
+        tmp_path = path / f"{name}.tmp"
+        frame.reset_index().to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path / f"{name}.parquet")
+
+def stored_rollup_years():
+    return sorted(int(path.name.split("=")[1]) for path in TRENDS_STORE.glob("Season=*") if (path / "month.parquet").exists())
+
+# Rollups of every stored season before year, read once and kept until a season is added to the store
+def read_stored_rollups(year):
+    years = [stored for stored in stored_rollup_years() if stored < year]
+    key = "trend_rollups_stored"
+    memory = get_memory_cache()
+    entry = memory.get(key)
+    if entry is not None and entry[0] == years:
+        return entry[1]
+
+    frames = {"season": [], "month": []}
+    for stored in years:
+        for name, index in (("season", ['Franchise', 'Season']), ("month", ['Franchise', 'Season', 'Month'])):
+            frames[name].append(pd.read_parquet(trend_season_dir(stored) / f"{name}.parquet").set_index(index))
+    stored = tuple(pd.concat(frames[name]) if frames[name] else None for name in ("season", "month"))
+    memory[key] = (years, stored)
+    return stored
+
+# The current season's rollups, rebuilt only when its schedule, team data or attendance snapshot changes
+def get_current_rollups(year):
+    schedule = current_league_schedule(year)
+    team_data = get_team_data(year)
+    attendance = attendance_or_empty(year)
+    return derived_snapshot(f"trend_rollups_{year}", (schedule, team_data, attendance),
+                            lambda: build_season_rollups(year, schedule, team_data, attendance))
+
+# Season and month rollups of every franchise from the stored seasons and the current one,
+# sorted by franchise so a franchise's whole history is one indexed read. When only the current
+# season changes, the stored seasons are reused and just the concat is redone.
+def get_trend_rollups():
+    year = datetime.datetime.now().year
+    stored_season, stored_month = read_stored_rollups(year)
+    try:
+        current_season, current_month = get_current_rollups(year)
+    except Exception as e:
+        print(f"Error building the {year} rollups: {e}")
+        count("mlb_fallbacks", dataset="trend_rollups", source="stored")
+        current_season = current_month = None
+
+    def combine():
+        season = [frame for frame in (stored_season, current_season) if frame is not None]
+        month = [frame for frame in (stored_month, current_month) if frame is not None]
+        if not season:
+            return {"season": pd.DataFrame(), "month": pd.DataFrame()}
+        return {"season": pd.concat(season).sort_index(), "month": pd.concat(month).sort_index()}
+    return derived_snapshot("trend_rollups", (stored_season, current_season), combine)
+
+# A franchise's season or month series, e.g. franchise_trend("WSN") includes the Expos years
+def franchise_trend(franchise, by="season"):
+    rollup = get_trend_rollups()[by]
+    if rollup.empty or franchise not in rollup.index.get_level_values('Franchise'):
+        return None
+    return rollup.loc[franchise]
+
+# Build the stored rollups for a range of finished seasons. Team stats come from the columnar
+# store (fetched and ingested if a season is missing), schedules and attendance are one statsapi
+# request per season each. Seasons already in the rollup store are skipped unless rebuild=True.
+def build_trend_rollups(start, end, max_workers=4, rebuild=False):
+    end = min(end, datetime.datetime.now().year - 1)
+    stored = set(stored_rollup_years())
+
+    def build(year):
+        if year in stored and not rebuild:
+            return year, None
+        try:
+            team_data = read_team_season(year, trend_team_columns)
+            if team_data is None:
+                team_data = fetch_team_data(year)
+                if is_fallback(team_data):
+                    raise RuntimeError("FanGraphs is unavailable, the statsapi fallback isn't stored")
+                write_team_season(team_data, year)
+            rollups = build_season_rollups(year, get_league_schedule(year), team_data, attendance_or_empty(year))
+            write_season_rollups(year, *rollups)
+            return year, None
+        except Exception as e:
+            return year, e
+
+    results = fetch_all(build, range(start, end + 1), max_workers=max_workers)
+    for year, error in results:
+        if error is not None:
+            print(f"{year}: failed: {error}")
+    return [year for year, error in results if error is None]
@@ -0,0 +1,123 @@
+import streamlit as st
+import requests
+import json
+import time
+import threading
+import hashlib
+from urllib.parse import urlparse, urlencode
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+
+from mlb_dashboard.config import FETCH_BACKOFF, FETCH_RETRIES, FETCH_WORKERS, HOST_CONCURRENCY, HTTP_TIMEOUT, STATSAPI_BASE
+from mlb_dashboard.cache import clear_cache, read_disk_cache, write_disk_cache
+from mlb_dashboard.metrics import count, timed
+from mlb_dashboard.sources import get_data_source
+
+# Shared HTTP session with keep-alive pooling, used by every outbound request
+@st.cache_resource
+def get_http_session():
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=FETCH_WORKERS)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+# One semaphore per host caps how many requests hit the same server at once
+@st.cache_resource
+def get_host_semaphores():
+    return {}
+
+# ETag/Last-Modified validators and bodies of revalidated responses, keyed by URL
+@st.cache_resource
+def get_http_validators():
+    return {}
+
+def validated_response_cache_key(key):
+    return "http_" + hashlib.sha1(key.encode()).hexdigest()
+
+def read_validated_response(key):
+    validators = get_http_validators()
+    if key not in validators:
+        entry = read_disk_cache(validated_response_cache_key(key))
+        if entry is not None:
+            validators[key] = entry
+    return validators.get(key)
+
+def write_validated_response(key, response):
+    entry = {
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+        "content": response.content,
+    }
+    get_http_validators()[key] = entry
+    write_disk_cache(validated_response_cache_key(key), entry)
+
+# Forget a stored response so the next request downloads it in full
+def forget_validated_response(key):
+    get_http_validators().pop(key, None)
+    clear_cache(validated_response_cache_key(key))
+
+# GET a URL and return the body bytes, through the data source so responses can be recorded and
+# replayed. Snapshots are keyed on the path and query, so a recording replays whichever host
+# (e.g. a local stub) it was made against.
+def http_get(url, params=None, revalidate=False):
+    path = urlparse(url).path
+    request = (path, sorted((params or {}).items()))
+    name = path.rstrip("/").rsplit("/", 1)[-1] or urlparse(url).netloc
+    return get_data_source().fetch("http", name, request, lambda: fetch_url(url, params, revalidate))
+
+# GET a URL from the network. Requests have strict connect/read timeouts and are retried
+# with backoff on connection errors, 429 and 5xx. With revalidate=True the last body is kept and
+# sent back with If-None-Match/If-Modified-Since, so an unchanged payload only costs a 304.
+def fetch_url(url, params=None, revalidate=False):
+    key = url + ("?" + urlencode(sorted(params.items())) if params else "")
+    cached = read_validated_response(key) if revalidate else None
+    headers = {}
+    if cached:
+        if cached["etag"]:
+            headers["If-None-Match"] = cached["etag"]
+        if cached["last_modified"]:
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+    host = urlparse(url).netloc
+    semaphore = get_host_semaphores().setdefault(host, threading.BoundedSemaphore(HOST_CONCURRENCY))
+    for attempt in range(FETCH_RETRIES):
+        try:
+            with semaphore, timed("mlb_upstream_seconds", host=host):
+                response = get_http_session().get(url, params=params, headers=headers, timeout=HTTP_TIMEOUT)
+            count("mlb_upstream_requests", host=host, status=response.status_code)
+            count("mlb_upstream_bytes", len(response.content), host=host)
+            if response.status_code == 304 and cached:
+                return cached["content"]
+            response.raise_for_status()
+            break
+        except requests.RequestException as e:
+            # Client errors won't succeed on a retry, rate limits and server errors might
+            status = e.response.status_code if e.response is not None else None
+            if status is None:
+                count("mlb_upstream_requests", host=host, status="error")
+            if attempt == FETCH_RETRIES - 1 or (status is not None and status < 500 and status != 429):
+                raise
+            count("mlb_upstream_retries", host=host)
+            time.sleep(FETCH_BACKOFF * 2 ** attempt)
+
+    if revalidate and (response.headers.get("ETag") or response.headers.get("Last-Modified")):
+        write_validated_response(key, response)
+    return response.content
+
+def statsapi_get_json(path, params=None):
+    return json.loads(http_get(f"{STATSAPI_BASE}/{path}", params))
+
+# Run func over items on a bounded thread pool, results come back in the same order as items
+def fetch_all(func, items, max_workers=FETCH_WORKERS):
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(func, items))
+
+# Pull the stat dict of the first season split, optionally for a single stat group
+def first_split_stat(data, group=None):
+    for stats in data.get('stats', []):
+        if group and stats.get('group', {}).get('displayName') != group:
+            continue
+        if stats.get('splits'):
+            return dict(stats['splits'][0]['stat'])
+    return None